@@ -34,13 +34,20 @@ class Settings(BaseSettings):
     postgres_port: int = 5432
     postgres_host: str = "127.0.0.1"
     postgres_db: str = "lightcurvedb"
+    postgres_pool_min_size: int = 2
+    postgres_pool_max_size: int = 10
+    postgres_prepare_threshold: int | None = 1
 
     parquet_base_path: Path = "./data"
+    parquet_io_threads: int | None = None
 
     backend_type: Literal["postgres", "timescale", "parquet"] = "postgres"
     bulk_insert_mode: Literal["unnest", "json", "csv"] = "csv"
     parquet_ingest_mode: Literal["csv", "duckdb"] = "csv"
 
+    flux_partition_start_year: int = 2020
+    flux_partition_end_year: int = 2040
+
     model_config = SettingsConfigDict(env_prefix="LIGHTCURVEDB_")
 
     @property
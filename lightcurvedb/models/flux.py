@@ -29,7 +29,7 @@ class FluxMeasurement(BaseModel):
     ra_uncertainty: float | None
     dec_uncertainty: float | None
     flux: float
-    flux_err: float
+    flux_err: float | None
     extra: MeasurementMetadata | None = None
 
     def model_dump_tuple(self) -> tuple:
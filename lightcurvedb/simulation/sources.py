@@ -2,7 +2,7 @@
 Source generation.
 """
 
-from random import randint, random
+import numpy as np
 
 from lightcurvedb.models.source import CrossMatch, Source, SourceMetadata
 from lightcurvedb.storage.prototype.backend import Backend
@@ -24,17 +24,21 @@ async def create_fixed_sources(number: int, backend: Backend) -> list[int]:
     list[int]
         The IDs of the created sources.
     """
+    ras = (np.random.rand(number) * 360.0 - 180.0).tolist()
+    decs = (np.random.rand(number) * 180.0 - 90.0).tolist()
+    cross_match_ids = np.random.randint(0, 10_001, size=number).tolist()
+
     sources = [
         Source(
             name=f"SIM-{i:05d}",
-            ra=random() * 360.0 - 180.0,
-            dec=random() * 180.0 - 90.0,
+            ra=ra,
+            dec=dec,
             variable=False,
             extra=SourceMetadata(
-                cross_matches=[CrossMatch(name=f"ACT-{randint(0, 10_000):05d}")]
+                cross_matches=[CrossMatch(name=f"ACT-{cross_match_id:05d}")]
             ),
         )
-        for i in range(number)
+        for i, (ra, dec, cross_match_id) in enumerate(zip(ras, decs, cross_match_ids))
     ]
 
     if sources:
@@ -0,0 +1,20 @@
+"""
+Helpers shared by the bulk ingest paths of the storage backends.
+"""
+
+import numpy as np
+
+
+def validate_positions(ra: np.ndarray, dec: np.ndarray) -> None:
+    """
+    Check a batch of positions against the ranges enforced by the flux
+    table, so that bad rows are rejected before a bulk COPY starts rather
+    than aborting it part-way through.
+    """
+    valid = (ra >= -180.0) & (ra <= 180.0) & (dec >= -90.0) & (dec <= 90.0)
+
+    if not valid.all():
+        raise ValueError(
+            f"{int(valid.size - np.count_nonzero(valid))} measurements have "
+            "ra outside [-180, 180] or dec outside [-90, 90]"
+        )
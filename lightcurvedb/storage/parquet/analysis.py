@@ -4,17 +4,91 @@ Analysis of flux measurements and lightcurves.
 
 from __future__ import annotations
 
-import asyncio
 from datetime import datetime
 from uuid import UUID
 
+import numpy as np
 import pandas as pd
+import pyarrow.dataset as ds
 
 from lightcurvedb.models.statistics import SourceStatistics
-from lightcurvedb.storage.parquet.flux import PandasFluxMeasurementStorage
+from lightcurvedb.storage.parquet.flux import PandasFluxMeasurementStorage, as_utc
 from lightcurvedb.storage.prototype.analysis import ProvidesAnalysis
 
 
+def _flux_moments(
+    flux: np.ndarray, flux_err: np.ndarray
+) -> tuple[float, float, float, float, float, float, float]:
+    # Written with the operations numba supports (no ddof, no np.dot), so
+    # that the same function runs as plain NumPy or compiled.
+    valid_err = (flux_err != 0) & ~np.isnan(flux_err)
+    inverse_variance = 1.0 / np.square(flux_err[valid_err])
+    weight_sum = inverse_variance.sum()
+
+    if weight_sum == 0:
+        weighted_mean = np.nan
+        weighted_error = np.nan
+    else:
+        weighted_mean = (flux[valid_err] * inverse_variance).sum() / weight_sum
+        weighted_error = 1.0 / np.sqrt(weight_sum)
+
+    mean = flux.mean()
+
+    if flux.size > 1:
+        stddev = np.sqrt(np.square(flux - mean).sum() / (flux.size - 1))
+    else:
+        stddev = np.nan
+
+    return (
+        flux.min(),
+        flux.max(),
+        mean,
+        stddev,
+        np.median(flux),
+        weighted_mean,
+        weighted_error,
+    )
+
+
+try:
+    import numba
+
+    # As for bin_sums in the lightcurve provider: with the optional numba
+    # extra installed, compile the reductions and release the GIL while they
+    # run on the worker threads.
+    _flux_moments = numba.njit(cache=True, nogil=True)(_flux_moments)
+except ImportError:
+    pass
+
+
+def flux_statistics(flux: np.ndarray, flux_err: np.ndarray) -> dict[str, float | int]:
+    """
+    Reduce non-empty float64 flux and uncertainty arrays to the flux
+    fields of SourceStatistics. Measurements with a zero or missing
+    uncertainty are excluded from the weighted mean only.
+    """
+    (
+        min_flux,
+        max_flux,
+        mean_flux,
+        stddev_flux,
+        median_flux,
+        weighted_mean,
+        weighted_error,
+    ) = _flux_moments(flux, flux_err)
+
+    return {
+        "measurement_count": int(flux.size),
+        "min_flux": float(min_flux),
+        "max_flux": float(max_flux),
+        "mean_flux": float(mean_flux),
+        "stddev_flux": float(stddev_flux),
+        "median_flux": float(median_flux),
+        "weighted_mean_flux": float(weighted_mean),
+        "weighted_error_on_mean_flux": float(weighted_error),
+    }
+
+
 class PandasAnalysis(ProvidesAnalysis):
     def __init__(self, flux_storage: PandasFluxMeasurementStorage):
         self.flux_storage = flux_storage
@@ -39,54 +113,71 @@ class PandasAnalysis(ProvidesAnalysis):
         given frequency.
         """
 
-        if (table := await self.flux_storage._read_file(source_id)) is None:
-            raise ValueError(f"No flux data for source {source_id}")
-
-        filtered = table
+        predicate = ds.field("frequency") == frequency
 
         if module != "all":
-            filtered = filtered[filtered["module"] == module]
+            predicate &= ds.field("module") == module
+
+        # Push the time bounds into the scan too, so row groups outside the
+        # window are skipped using their statistics.
+        if start_time is not None:
+            predicate &= ds.field("time") >= as_utc(start_time)
+        if end_time is not None:
+            predicate &= ds.field("time") <= as_utc(end_time)
+
+        if (
+            table := await self.flux_storage._read_file(
+                source_id, predicate, columns=["time", "flux", "flux_err"]
+            )
+        ) is None:
+            raise ValueError(f"No flux data for source {source_id}")
+
+        return self._statistics_from_table(
+            source_id=source_id,
+            table=table,
+            module=module,
+            frequency=frequency,
+            start_time=start_time,
+            end_time=end_time,
+        )
 
-        filtered = filtered[filtered["frequency"] == frequency]
+    def _statistics_from_table(
+        self,
+        source_id: UUID,
+        table: pd.DataFrame,
+        module: str,
+        frequency: int,
+        start_time: datetime | None,
+        end_time: datetime | None,
+    ) -> SourceStatistics:
+        """
+        Compute statistics over measurements already selected for the
+        module (or all modules) and frequency.
+        """
+        filtered = table
 
         if start_time is not None:
-            filtered = filtered[filtered["time"] >= start_time]
+            filtered = filtered[filtered["time"] >= as_utc(start_time)]
         if end_time is not None:
-            filtered = filtered[filtered["time"] <= end_time]
+            filtered = filtered[filtered["time"] <= as_utc(end_time)]
 
         if filtered.empty:
             raise ValueError(
                 f"No flux data for source {source_id} and combination {module} {frequency}"
             )
 
-        flux = filtered["flux"]
-        flux_err = filtered["flux_err"].replace(0, pd.NA)
-        valid_err = flux_err.notna()
-
-        weights = 1.0 / (flux_err[valid_err] ** 2)
-        if weights.empty or weights.sum() == 0:
-            weighted_mean = float("nan")
-            weighted_error = float("nan")
-        else:
-            weighted_mean = (
-                flux[valid_err] / (flux_err[valid_err] ** 2)
-            ).sum() / weights.sum()
-            weighted_error = 1.0 / weights.sum() ** 0.5
-
         return SourceStatistics(
             source_id=source_id,
             module=module,
             frequency=frequency,
             start_time=filtered["time"].min(),
             end_time=filtered["time"].max(),
-            measurement_count=int(filtered.shape[0]),
-            min_flux=float(flux.min()),
-            max_flux=float(flux.max()),
-            mean_flux=float(flux.mean()),
-            stddev_flux=float(flux.std()),
-            median_flux=float(flux.median()),
-            weighted_mean_flux=float(weighted_mean),
-            weighted_error_on_mean_flux=float(weighted_error),
+            **flux_statistics(
+                flux=filtered["flux"].to_numpy(dtype=np.float64),
+                flux_err=filtered["flux_err"].to_numpy(
+                    dtype=np.float64, na_value=np.nan
+                ),
+            ),
         )
 
     async def get_source_statistics_for_frequency(
@@ -116,39 +207,50 @@ class PandasAnalysis(ProvidesAnalysis):
     ) -> dict[str, SourceStatistics]:
         """
         Get source statistics across all frequencies and modules.
+        Combinations with no measurements inside the time window are
+        omitted.
         """
-        table = await self.flux_storage._read_file(source_id)
+        predicate = None
+
+        if start_time is not None:
+            predicate = ds.field("time") >= as_utc(start_time)
+        if end_time is not None:
+            bound = ds.field("time") <= as_utc(end_time)
+            predicate = bound if predicate is None else predicate & bound
+
+        table = await self.flux_storage._read_file(
+            source_id,
+            predicate,
+            columns=["module", "frequency", "time", "flux", "flux_err"],
+        )
         if table is None or table.empty:
             return {}
 
-        module_frequency_pairs = (
-            table[["module", "frequency"]]
-            .dropna()
-            .drop_duplicates()
-            .itertuples(index=False, name=None)
-        )
+        # Read the source once and compute every combination from the
+        # in-memory table rather than re-reading it per pair. Pairs are
+        # discovered by the same hashed groupby pass that splits the data,
+        # so only pairs with rows inside the window appear, and only the
+        # columns the statistics use are read at all.
+        if collate_modules:
+            groups = (
+                (("all", frequency), group)
+                for frequency, group in table.groupby("frequency", sort=True)
+            )
+        else:
+            groups = table.groupby(["module", "frequency"], sort=False)
 
-        pairs = [
-            (module, int(frequency)) for module, frequency in module_frequency_pairs
+        statistics = [
+            self._statistics_from_table(
+                source_id=source_id,
+                table=group,
+                module=module,
+                frequency=int(frequency),
+                start_time=start_time,
+                end_time=end_time,
+            )
+            for (module, frequency), group in groups
         ]
 
-        if collate_modules:
-            unique_frequencies = sorted({frequency for _, frequency in pairs})
-            pairs = [("all", freq) for freq in unique_frequencies]
-
-        statistics = await asyncio.gather(
-            *[
-                self.get_source_statistics_for_frequency_and_module(
-                    source_id=source_id,
-                    module=module,
-                    frequency=frequency,
-                    start_time=start_time,
-                    end_time=end_time,
-                )
-                for module, frequency in pairs
-            ]
-        )
-
         if collate_modules:
             return {str(stats.frequency): stats for stats in statistics}
 
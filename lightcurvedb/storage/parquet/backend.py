@@ -12,10 +12,14 @@ from lightcurvedb.storage.parquet.source import PandasSourceStorage
 from lightcurvedb.storage.prototype.backend import Backend
 
 
-async def generate_pandas_backend(directory: Path) -> Backend:
+async def generate_pandas_backend(
+    directory: Path, io_threads: int | None = None
+) -> Backend:
     sources = PandasSourceStorage(directory / "sources.parquet")
     instruments = PandasInstrumentStorage(directory / "instruments.parquet")
-    fluxes = PandasFluxMeasurementStorage(directory / "fluxes.parquet")
+    fluxes = PandasFluxMeasurementStorage(
+        directory / "fluxes.parquet", io_threads=io_threads
+    )
     cutouts = PandasCutoutStorage(directory / "cutouts.parquet")
     lightcurves = PandasLightcurves(flux_storage=fluxes)
     analysis = PandasAnalysis(flux_storage=fluxes)
@@ -39,5 +43,7 @@ async def pandas_backend(settings: Settings) -> AsyncIterator[Backend]:
     """
     Get a Pandas storage backend.
     """
-    backend = await generate_pandas_backend(directory=settings.parquet_base_path)
+    backend = await generate_pandas_backend(
+        directory=settings.parquet_base_path, io_threads=settings.parquet_io_threads
+    )
     yield backend
@@ -4,76 +4,161 @@ Prototype for cutout storage interactions
 
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
 from pathlib import Path
 from typing import Iterable
 from uuid import UUID
 
 import pandas as pd
+import pyarrow.dataset as ds
 from asyncer import asyncify
+from uuid_extensions import uuid7
 
 from lightcurvedb.models import Cutout
 from lightcurvedb.models.exceptions import CutoutNotFoundException
+from lightcurvedb.storage.parquet.sidecar import SidecarIndex
 from lightcurvedb.storage.prototype.cutout import ProvidesCutoutStorage
 
 
 class PandasCutoutStorage(ProvidesCutoutStorage):
+    """
+    Cutouts stored as ``base_path/source_id=<uuid>/part-*.parquet``. Each
+    insert writes a new fragment, so appending never reads or rewrites the
+    cutouts already stored for the source. A SQLite sidecar,
+    ``base_path/cutout_index.sqlite``, maps cutout IDs to their source for
+    deletes.
+    """
+
     def __init__(self, path: Path):
         if path.suffix == ".parquet":
             path = path.with_suffix("")
 
         self.base_path = path
+        self.index_path = path / "cutout_index.sqlite"
+        self._index = SidecarIndex(self.index_path, "cutout_index", "TEXT")
 
         self._read_file = asyncify(self._read_file_sync)
         self._write_file = asyncify(self._write_file_sync)
+        self._delete = asyncify(self._delete_sync)
+        self._lookup = asyncify(self._lookup_sync)
+        self._setup = asyncify(self._setup_sync)
 
     def _source_path(self, source_id: UUID) -> Path:
-        return self.base_path / f"{source_id}.parquet"
+        return self.base_path / f"source_id={source_id}"
 
     def _read_file_sync(self, source_id: UUID) -> pd.DataFrame | None:
-        path = self._source_path(source_id)
-        if not path.exists():
+        fragments = sorted(self._source_path(source_id).glob("*.parquet"))
+        if not fragments:
+            return None
+        # Scan all fragments as one dataset so they are decoded in parallel
+        # instead of one read_parquet (and a concat copy) per file.
+        return (
+            ds.dataset([str(fragment) for fragment in fragments], format="parquet")
+            .to_table()
+            .to_pandas()
+        )
+
+    def _lookup_sync(self, source_id: UUID, measurement_id: str) -> list[dict] | None:
+        # Push the ID into the scan so only the matching row is decoded,
+        # rather than loading every cutout for the source.
+        fragments = sorted(self._source_path(source_id).glob("*.parquet"))
+        if not fragments:
             return None
-        table = pd.read_parquet(path)
-        return table
 
-    def _write_file_sync(self, source_id: UUID, table: pd.DataFrame) -> None:
-        self.base_path.mkdir(parents=True, exist_ok=True)
-        table.to_parquet(self._source_path(source_id))
+        return (
+            ds.dataset([str(fragment) for fragment in fragments], format="parquet")
+            .to_table(filter=ds.field("measurement_id") == measurement_id)
+            .to_pylist()
+        )
+
+    def _write_file_sync(
+        self, source_id: UUID, table: pd.DataFrame, fragment_name: str | None = None
+    ) -> None:
+        # Index the cutouts before publishing them, so that no stored cutout
+        # is ever missing from the sidecar.
+        self._index.insert(
+            (measurement_id, str(source_id)) for measurement_id in table.index
+        )
+
+        self._write_fragment_sync(self._source_path(source_id), table, fragment_name)
+
+    def _write_fragment_sync(
+        self, directory: Path, table: pd.DataFrame, name: str | None = None
+    ) -> None:
+        # Write under a temporary name and rename into place so readers
+        # never see a partial fragment. A given name replaces any existing
+        # fragment of that name.
+        directory.mkdir(parents=True, exist_ok=True)
+
+        name = name or f"part-{uuid7(as_type='hex')}.parquet"
+        temporary = directory / f".{name}.tmp"
+        table.to_parquet(temporary)
+        temporary.replace(directory / name)
 
     def _new_table(self, cutouts: Iterable[Cutout]) -> pd.DataFrame:
-        rows = []
-        for cutout in cutouts:
-            row = cutout.model_dump()
-            row["measurement_id"] = str(cutout.measurement_id)
-            row["source_id"] = str(cutout.source_id)
-
-            rows.append(row)
-
-        table = pd.DataFrame(rows)
-        table.set_index("measurement_id", inplace=True)
-        table["source_id"] = table["source_id"].astype(str)
-        return table
+        # Build column-wise from the model attributes, as the flux storage
+        # does; model_dump would deep-copy every cutout's pixel data.
+        cutouts = list(cutouts)
+
+        return pd.DataFrame(
+            {
+                "data": [cutout.data for cutout in cutouts],
+                "time": [cutout.time for cutout in cutouts],
+                "units": [cutout.units for cutout in cutouts],
+                "frequency": [cutout.frequency for cutout in cutouts],
+                "module": [cutout.module for cutout in cutouts],
+                "source_id": [str(cutout.source_id) for cutout in cutouts],
+            },
+            index=pd.Index(
+                [str(cutout.measurement_id) for cutout in cutouts],
+                name="measurement_id",
+            ),
+        )
 
     async def setup(self) -> None:
         """
         Set up the cutout storage system (e.g. create the tables).
         """
+        await self._setup()
+
+    def _setup_sync(self) -> None:
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self._index.create()
 
-    async def create(self, cutout: Cutout) -> int:
+        for path in sorted(self.base_path.glob("*.parquet")):
+            self._migrate_legacy_sync(path)
+
+    def _migrate_legacy_sync(self, path: Path) -> None:
         """
-        Store a cutout for a given source and band.
+        Move a ``<source_id>.parquet`` file written by versions before the
+        per-source directories into a fragment, then remove it. The fragment
+        has a fixed name, so if this is interrupted before the file is
+        removed, the next setup replaces it rather than duplicating the
+        cutouts.
         """
-        new_table = self._new_table([cutout])
+        table = pd.read_parquet(path)
 
-        if (table := await self._read_file(cutout.source_id)) is not None:
-            new_table = pd.concat([table, new_table])
+        if not table.empty:
+            self._write_file_sync(
+                UUID(path.stem),
+                table[["data", "time", "units", "frequency", "module", "source_id"]],
+                fragment_name="part-legacy.parquet",
+            )
+
+        path.unlink()
 
-        await self._write_file(cutout.source_id, new_table)
+    async def create(self, cutout: Cutout) -> int:
+        """
+        Store a cutout for a given source and band.
+        """
+        await self._append(cutout.source_id, [cutout])
 
         return cutout.measurement_id
 
+    async def _append(self, source_id: UUID, cutouts: list[Cutout]) -> None:
+        await self._write_file(source_id, self._new_table(cutouts))
+
     async def create_batch(self, cutouts: list[Cutout]) -> list[int]:
         """
         Store a cutout for a given source and band.
@@ -85,11 +170,11 @@ class PandasCutoutStorage(ProvidesCutoutStorage):
         for cutout in cutouts:
             grouped[cutout.source_id].append(cutout)
 
-        for source_id, group in grouped.items():
-            new_table = self._new_table(group)
-            if (table := await self._read_file(source_id)) is not None:
-                new_table = pd.concat([table, new_table])
-            await self._write_file(source_id, new_table)
+        # Each source lives in its own directory, so the groups can be
+        # written concurrently on the worker threads.
+        await asyncio.gather(
+            *[self._append(source_id, group) for source_id, group in grouped.items()]
+        )
 
         return [cutout.measurement_id for cutout in cutouts if cutout.measurement_id]
 
@@ -103,13 +188,11 @@ class PandasCutoutStorage(ProvidesCutoutStorage):
         if (table := await self._read_file(source_id)) is None:
             return []
 
-        cutouts = []
-        for measurement_id, row in table.iterrows():
-            data = row.to_dict()
-            data["measurement_id"] = measurement_id
-            cutouts.append(Cutout.model_validate(data))
-
-        return cutouts
+        # Extract the columns once rather than boxing a Series per row.
+        return [
+            Cutout.model_validate(record)
+            for record in table.reset_index().to_dict(orient="records")
+        ]
 
     async def retrieve_cutout(self, source_id: int, measurement_id: int) -> Cutout:
         """
@@ -118,33 +201,40 @@ class PandasCutoutStorage(ProvidesCutoutStorage):
         if not isinstance(source_id, UUID):
             source_id = UUID(str(source_id))
 
-        if (table := await self._read_file(source_id)) is None:
+        if (rows := await self._lookup(source_id, str(measurement_id))) is None:
             raise CutoutNotFoundException("Cutout table not found")
 
-        measurement_id_str = str(measurement_id)
-        if measurement_id_str not in table.index:
+        if not rows:
             raise CutoutNotFoundException(
                 f"Cutout with measurement ID {measurement_id} not found"
             )
 
-        row = table.loc[measurement_id_str].to_dict()
-        row["measurement_id"] = measurement_id_str
-        return Cutout.model_validate(row)
+        return Cutout.model_validate(rows[0])
 
     async def delete(self, cutout_id: int) -> None:
         """
         Delete a cutout by ID.
         """
-        cutout_id_str = str(cutout_id)
-        if not self.base_path.exists():
-            return
-
-        for path in self.base_path.glob("*.parquet"):
-            source_id = UUID(path.stem)
-            table = await self._read_file(source_id)
-            if table is None or cutout_id_str not in table.index:
+        await self._delete(str(cutout_id))
+
+    def _delete_sync(self, cutout_id: str) -> None:
+        # Only the owning source's fragments need to be searched; anything
+        # missing from the index falls back to scanning every source.
+        if (source_id := self._index.source(cutout_id)) is not None:
+            candidates = self._source_path(source_id).glob("*.parquet")
+        else:
+            candidates = self.base_path.glob("source_id=*/*.parquet")
+
+        for path in candidates:
+            table = pd.read_parquet(path)
+            if cutout_id not in table.index:
                 continue
 
-            table.drop(cutout_id_str, axis=0, inplace=True)
-            await self._write_file(source_id, table)
-            return
+            remaining = table.drop(cutout_id, axis=0)
+            if not remaining.empty:
+                self._write_fragment_sync(path.parent, remaining)
+
+            path.unlink()
+            break
+
+        self._index.remove(cutout_id)
@@ -1,93 +1,390 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from typing import Iterable
+from urllib.parse import quote, unquote
 from uuid import UUID
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from anyio import CapacityLimiter
 from asyncer import asyncify
 from typing_extensions import Literal
 from uuid_extensions import uuid7
 
 from lightcurvedb.models.flux import FluxMeasurement
+from lightcurvedb.storage.ingest import validate_positions
+from lightcurvedb.storage.parquet.sidecar import SidecarIndex
 from lightcurvedb.storage.prototype.flux import ProvidesFluxMeasurementStorage
 
+FLUX_SCHEMA = pa.schema(
+    [
+        ("measurement_id", pa.binary(16)),
+        ("frequency", pa.int64()),
+        ("module", pa.string()),
+        ("source_id", pa.string()),
+        ("time", pa.timestamp("us", tz="UTC")),
+        ("ra", pa.float32()),
+        ("dec", pa.float32()),
+        ("ra_uncertainty", pa.float32()),
+        ("dec_uncertainty", pa.float32()),
+        ("flux", pa.float32()),
+        ("flux_err", pa.float32()),
+        ("extra", pa.struct([("flags", pa.list_(pa.string()))])),
+    ]
+)
+"""
+Schema of the flux dataset. Every fragment is written with exactly this
+schema so that appends with all-null columns still unify on read.
+Measurement IDs are stored as their raw 16 bytes rather than as 36
+character strings.
+Positions and fluxes are single precision, as in the PostgreSQL
+schema; readers widen them to float64 before doing arithmetic. Values are
+rounded to float32 (about seven significant digits) when written,
+including when a float64 store from an earlier version is migrated, so
+they may differ from the inputs in the last digits.
+"""
+
+SOURCE_SCHEMA = FLUX_SCHEMA.remove(FLUX_SCHEMA.get_field_index("source_id"))
+"""
+Schema of a single source's dataset; the source ID lives in the
+partition directory name.
+"""
+
+PARTITION_SCHEMA = pa.schema(
+    [FLUX_SCHEMA.field("frequency"), FLUX_SCHEMA.field("module")]
+)
+"""
+Schema of the hive partition directories below each source.
+"""
+
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+FRAGMENT_SCHEMA = pa.schema(
+    [field for field in SOURCE_SCHEMA if field.name not in PARTITION_SCHEMA.names]
+)
+"""
+Schema of an individual fragment file; the frequency and module live in
+the partition directory names.
+"""
+
+FRAGMENT_GLOB = "frequency=*/module=*/*.parquet"
+
+ROW_GROUP_SIZE = 50_000
+"""
+Rows per parquet row group. Fragments are sorted by time, so each row
+group's time statistics let windowed scans skip it.
+"""
+
+LEGACY_FRAGMENT = "part-legacy.parquet"
+"""
+Name of the fragment that each partition's rows from a pre-partitioning
+``<source_id>.parquet`` file are migrated into.
+"""
+
+COMPACTION_THRESHOLD = 16
+"""
+Number of fragments a partition may accumulate before compact() merges them.
+"""
+
+READ_CACHE_SIZE = 128
+"""
+Number of whole-source tables kept in the in-process read cache.
+"""
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Stored times are UTC; treat naive query bounds as UTC too.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
 
 class PandasFluxMeasurementStorage(ProvidesFluxMeasurementStorage):
-    def __init__(self, base_path: Path):
+    """
+    Flux measurements stored as a hive-partitioned parquet dataset,
+    ``base_path/source_id=<uuid>/frequency=<f>/module=<m>/part-*.parquet``,
+    so scans filtered on frequency or module only open the matching
+    fragments. Inserts append new
+    fragment files and never rewrite existing data. A SQLite sidecar,
+    ``base_path/measurement_index.sqlite``, maps measurement IDs to their
+    source for deletes. Blocking file work runs in worker threads, at most
+    ``io_threads`` (default: one per CPU) at a time.
+    """
+
+    def __init__(self, base_path: Path, io_threads: int | None = None):
         if base_path.suffix == ".parquet":
             base_path = base_path.with_suffix("")
 
         self.base_path = base_path
+        self.index_path = base_path / "measurement_index.sqlite"
+        self._index = SidecarIndex(self.index_path, "measurement_index", "BLOB")
+
+        self._read_fragments_cached = lru_cache(maxsize=READ_CACHE_SIZE)(
+            self._read_fragments_sync
+        )
 
-        self._read_file = asyncify(self._read_file_sync)
-        self._write_file = asyncify(self._write_file_sync)
+        # A limiter owned by the storage rather than anyio's process-wide
+        # default, so that parquet I/O cannot starve other worker threads
+        # and the concurrency can be sized to the underlying disks.
+        self._limiter = CapacityLimiter(io_threads or os.cpu_count() or 1)
+
+        self._read_file = asyncify(self._read_file_sync, limiter=self._limiter)
+        self._write_file = asyncify(self._write_file_sync, limiter=self._limiter)
+        self._delete = asyncify(self._delete_sync, limiter=self._limiter)
+        self._compact = asyncify(self._compact_sync, limiter=self._limiter)
+        self._partitions = asyncify(self._partitions_sync, limiter=self._limiter)
+        self._setup = asyncify(self._setup_sync, limiter=self._limiter)
 
     def _source_path(self, source_id: UUID) -> Path:
-        return self.base_path / f"{source_id}.parquet"
+        return self.base_path / f"source_id={source_id}"
+
+    def _partition_path(self, source_id: UUID, frequency: int, module: str) -> Path:
+        return (
+            self._source_path(source_id)
+            / f"frequency={frequency}"
+            / f"module={quote(module, safe='')}"
+        )
 
-    def _read_file_sync(self, source_id: UUID) -> pd.DataFrame | None:
+    def _read_file_sync(
+        self,
+        source_id: UUID,
+        filter: ds.Expression | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame | None:
+        """
+        Read the measurements for a source, optionally pushing a filter
+        and a column projection into the scan. The measurement_id column,
+        when read, becomes the index, and rows come back ordered by time
+        whenever the time column is read. Unfiltered reads are served from an
+        LRU cache keyed on the projection and the source's fragment
+        listing; fragments are immutable, so any write or delete changes
+        the key. Callers must not mutate the returned frame.
+        """
         path = self._source_path(source_id)
         if not path.exists():
             return None
-        table = pd.read_parquet(path)
-        return self._normalize_table(table)
 
-    def _write_file_sync(self, source_id: UUID, table: pd.DataFrame) -> None:
-        self.base_path.mkdir(parents=True, exist_ok=True)
-        table.to_parquet(self._source_path(source_id))
+        fragments = tuple(
+            sorted(
+                str(fragment.relative_to(path)) for fragment in path.glob(FRAGMENT_GLOB)
+            )
+        )
+        projection = None if columns is None else tuple(columns)
 
-    def _normalize_table(self, table: pd.DataFrame) -> pd.DataFrame:
-        if "measurement_id" in table.columns:
-            table = table.set_index("measurement_id")
+        if filter is None:
+            return self._read_fragments_cached(source_id, fragments, None, projection)
+
+        return self._read_fragments_sync(source_id, fragments, filter, projection)
+
+    def _partitions_sync(self, source_id: UUID) -> list[tuple[int, str]]:
+        """
+        The ``(frequency, module)`` partitions holding data for a source,
+        taken from the directory names alone without opening any fragment.
+        """
+        partitions = set()
 
-        table.index = table.index.astype(str)
+        for fragment in self._source_path(source_id).glob(FRAGMENT_GLOB):
+            module = fragment.parent.name.removeprefix("module=")
+            frequency = fragment.parent.parent.name.removeprefix("frequency=")
+            partitions.add((int(frequency), unquote(module)))
 
-        if "source_id" in table.columns:
-            table["source_id"] = table["source_id"].astype(str)
+        return sorted(partitions)
 
-        if "time" in table.columns:
-            table["time"] = pd.to_datetime(table["time"], utc=False)
+    def _read_fragments_sync(
+        self,
+        source_id: UUID,
+        fragments: tuple[str, ...],
+        filter: ds.Expression | None = None,
+        columns: tuple[str, ...] | None = None,
+    ) -> pd.DataFrame:
+        path = self._source_path(source_id)
+        dataset = ds.dataset(
+            [str(path / name) for name in fragments],
+            schema=SOURCE_SCHEMA,
+            format="parquet",
+            partitioning=PARTITIONING,
+            partition_base_dir=str(path),
+        )
+
+        # The source ID is not stored in the fragments, only in the
+        # directory name.
+        read_columns = (
+            None if columns is None else [c for c in columns if c != "source_id"]
+        )
+
+        # Fragments are written with FLUX_SCHEMA, so the columns already
+        # have their canonical types and need no casting here.
+        table = dataset.to_table(columns=read_columns, filter=filter)
+
+        # Order by time with an Arrow kernel before converting; each fragment
+        # is sorted on its own, but a source can span several.
+        if "time" in table.column_names:
+            table = table.take(pc.sort_indices(table["time"]))
+
+        frame = table.to_pandas()
+
+        # to_pandas turns the lists nested in the extra struct into numpy
+        # arrays, which the models cannot serialize; take plain Python
+        # values for that column instead.
+        if "extra" in table.column_names:
+            frame["extra"] = table["extra"].to_pylist()
+
+        table = frame
+
+        if columns is None or "source_id" in columns:
+            table["source_id"] = str(source_id)
+
+        if "measurement_id" in table.columns:
+            table = table.set_index("measurement_id")
 
         return table
 
-    def _new_table(self, measurements: Iterable[FluxMeasurement]) -> pd.DataFrame:
-        table = pd.DataFrame(
+    def _write_file_sync(
+        self, table: pa.Table, fragment_name: str | None = None
+    ) -> None:
+        arrow_table = table.sort_by(
             [
-                {
-                    **measurement.model_dump(),
-                    "measurement_id": str(measurement.measurement_id),
-                    "source_id": str(measurement.source_id),
-                }
-                for measurement in measurements
+                ("source_id", "ascending"),
+                ("frequency", "ascending"),
+                ("module", "ascending"),
+                ("time", "ascending"),
             ]
-        )
+        ).combine_chunks()
 
-        table.set_index("measurement_id", inplace=True)
+        if arrow_table.num_rows == 0:
+            return
 
-        return table
+        fragments = arrow_table.select(FRAGMENT_SCHEMA.names)
+
+        # Rows are sorted by partition, so each partition is one contiguous
+        # run; a run ends wherever any of the partition keys changes.
+        keys = ["source_id", *PARTITION_SCHEMA.names]
+        changes = np.zeros(max(arrow_table.num_rows - 1, 0), dtype=bool)
+        for key in keys:
+            values = arrow_table[key].to_numpy(zero_copy_only=False)
+            changes |= values[1:] != values[:-1]
+        ends = [*(np.flatnonzero(changes) + 1).tolist(), arrow_table.num_rows]
+
+        # Index the rows before publishing them, so that no stored row is
+        # ever missing from the sidecar.
+        self._index.insert(
+            zip(
+                arrow_table["measurement_id"].to_pylist(),
+                arrow_table["source_id"].to_pylist(),
+            )
+        )
+
+        start = 0
+        for end in ends:
+            source_id, frequency, module = (
+                arrow_table[key][start].as_py() for key in keys
+            )
+            self._write_fragment_sync(
+                self._partition_path(source_id, frequency, module),
+                fragments.slice(start, end - start),
+                fragment_name,
+            )
+            start = end
+
+    def _write_fragment_sync(
+        self, directory: Path, table: pa.Table, name: str | None = None
+    ) -> None:
+        """
+        Publish a new fragment in a source directory. The file is serialized
+        in memory, written with a single call under a temporary name and
+        then renamed into place, so readers never see a partial fragment.
+        Fragments get a fresh time-ordered name unless ``name`` is given,
+        in which case an existing fragment of that name is replaced.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink, row_group_size=ROW_GROUP_SIZE)
+
+        name = name or f"part-{uuid7(as_type='hex')}.parquet"
+        temporary = directory / f".{name}.tmp"
+        temporary.write_bytes(sink.getvalue())
+        temporary.replace(directory / name)
+
+    def _new_table(self, measurements: Iterable[FluxMeasurement]) -> pa.Table:
+        # Build the Arrow columns straight from the model attributes; the
+        # table is only ever written, so there is no need to go through
+        # pandas, and dumping every measurement to a dict would dominate the
+        # cost of large batches.
+        measurements = list(measurements)
+
+        return pa.Table.from_pydict(
+            {
+                "measurement_id": [m.measurement_id.bytes for m in measurements],
+                "frequency": [m.frequency for m in measurements],
+                "module": [m.module for m in measurements],
+                "source_id": [str(m.source_id) for m in measurements],
+                "time": [m.time for m in measurements],
+                "ra": [m.ra for m in measurements],
+                "dec": [m.dec for m in measurements],
+                "ra_uncertainty": [m.ra_uncertainty for m in measurements],
+                "dec_uncertainty": [m.dec_uncertainty for m in measurements],
+                "flux": [m.flux for m in measurements],
+                "flux_err": [m.flux_err for m in measurements],
+                "extra": [
+                    None if m.extra is None else m.extra.model_dump()
+                    for m in measurements
+                ],
+            },
+            schema=FLUX_SCHEMA,
+        )
 
     async def setup(self) -> None:
         """
         Set up the flux storage system (e.g. create the tables).
         """
+        await self._setup()
+
+    def _setup_sync(self) -> None:
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self._index.create()
 
-    async def create(self, measurement: FluxMeasurement) -> UUID:
+        for path in sorted(self.base_path.glob("*.parquet")):
+            self._migrate_legacy_sync(path)
+
+    def _migrate_legacy_sync(self, path: Path) -> None:
         """
-        Insert single measurement.
+        Convert a ``<source_id>.parquet`` file written by versions before
+        the partitioned layout into fragments, then remove it. Each
+        partition's rows go to a fragment with a fixed name, so if this is
+        interrupted before the file is removed, the next setup replaces
+        those fragments rather than duplicating the rows.
         """
-        new_table = self._new_table([measurement])
-        new_id = new_table.index.tolist()[0]
+        measurements = [
+            FluxMeasurement.model_validate(row)
+            for row in pq.read_table(path).to_pylist()
+        ]
 
-        if (table := await self._read_file(measurement.source_id)) is not None:
-            new_table = pd.concat([table, new_table])
+        if measurements:
+            self._write_file_sync(
+                self._new_table(measurements), fragment_name=LEGACY_FRAGMENT
+            )
 
-        await self._write_file(measurement.source_id, new_table)
+        path.unlink()
+
+    async def create(self, measurement: FluxMeasurement) -> UUID:
+        """
+        Insert single measurement.
+        """
+        await self._write_file(self._new_table([measurement]))
 
-        return UUID(new_id)
+        return measurement.measurement_id
 
     async def create_batch(
         self,
@@ -98,18 +395,10 @@ class PandasFluxMeasurementStorage(ProvidesFluxMeasurementStorage):
         Bulk insert
         """
 
-        grouped_measurements = defaultdict(list)
-
-        for measurement in measurements:
-            grouped_measurements[measurement.source_id].append(measurement)
-
-        for source_id, group in grouped_measurements.items():
-            new_table = self._new_table(group)
-
-            if (table := await self._read_file(source_id)) is not None:
-                new_table = pd.concat([table, new_table])
+        if not measurements:
+            return
 
-            await self._write_file(source_id, new_table)
+        await self._write_file(self._new_table(measurements))
 
     def _parse_source_id(self, source_id: object) -> UUID:
         if isinstance(source_id, UUID):
@@ -128,6 +417,8 @@ class PandasFluxMeasurementStorage(ProvidesFluxMeasurementStorage):
         """
         df = pd.read_parquet(parquet_bytes)
 
+        validate_positions(df["ra"].to_numpy(), df["dec"].to_numpy())
+
         df["source_id"] = [
             str(self._parse_source_id(source_id))
             for source_id in df["source_id"].tolist()
@@ -139,35 +430,97 @@ class PandasFluxMeasurementStorage(ProvidesFluxMeasurementStorage):
         for column in ["ra_uncertainty", "dec_uncertainty", "extra"]:
             df[column] = df[column].where(df[column].notna(), None)
 
-        df["measurement_id"] = [str(uuid7()) for _ in range(len(df))]
-        df.set_index("measurement_id", inplace=True)
+        # uuid_extensions has no batch generator; asking for raw bytes at
+        # least skips building a UUID object per row.
+        df["measurement_id"] = [uuid7(as_type="bytes") for _ in range(len(df))]
 
-        for source_id_str, group in df.groupby("source_id", sort=False):
-            source_id = UUID(source_id_str)
-            new_table = group
-
-            if (current := await self._read_file(source_id)) is not None:
-                new_table = pd.concat([current, new_table])
-
-            await self._write_file(source_id, new_table)
+        await self._write_file(
+            pa.Table.from_pandas(
+                df, schema=FLUX_SCHEMA, preserve_index=False
+            ).replace_schema_metadata(None)
+        )
 
     async def delete(self, measurement_id: UUID) -> None:
         """
         Delete a flux measurement by ID.
         """
-        measurement_id = str(measurement_id)
-        if not self.base_path.exists():
-            return
+        await self._delete(measurement_id.bytes)
+
+    def _delete_sync(self, measurement_id: bytes) -> None:
+        # Only the owning source's fragments need to be searched; anything
+        # missing from the index falls back to scanning every source.
+        if (source_id := self._index.source(measurement_id)) is not None:
+            candidates = self._source_path(source_id).glob(FRAGMENT_GLOB)
+        else:
+            candidates = self.base_path.glob(f"source_id=*/{FRAGMENT_GLOB}")
+
+        for path in candidates:
+            if not self._may_contain(path, measurement_id):
+                continue
 
-        for path in self.base_path.glob("*.parquet"):
-            source_id = UUID(path.stem)
-            table = await self._read_file(source_id)
-            if table is None:
+            ids = pq.read_table(path, columns=["measurement_id"])["measurement_id"]
+
+            if measurement_id not in ids.to_pylist():
                 continue
 
-            if measurement_id not in table.index:
+            remaining = pq.read_table(path, schema=FRAGMENT_SCHEMA).filter(
+                ds.field("measurement_id")
+                != pa.scalar(measurement_id, FLUX_SCHEMA.field("measurement_id").type)
+            )
+
+            # Replace rather than overwrite the fragment so that the
+            # fragment listing, and with it the read cache key, changes.
+            if remaining.num_rows > 0:
+                self._write_fragment_sync(path.parent, remaining)
+
+            path.unlink()
+
+            break
+
+        self._index.remove(measurement_id)
+
+    def _may_contain(self, path: Path, measurement_id: bytes) -> bool:
+        """
+        Check a fragment's footer statistics for whether any of its row
+        groups could hold the measurement, without reading any rows.
+        """
+        metadata = pq.ParquetFile(path).metadata
+        column = metadata.schema.names.index("measurement_id")
+
+        for row_group in range(metadata.num_row_groups):
+            statistics = metadata.row_group(row_group).column(column).statistics
+
+            if statistics is None or not statistics.has_min_max:
+                return True
+
+            if statistics.min <= measurement_id <= statistics.max:
+                return True
+
+        return False
+
+    async def compact(self, threshold: int = COMPACTION_THRESHOLD) -> None:
+        """
+        Merge the fragments of every partition that has more than
+        ``threshold`` of them into a single time-sorted fragment. Meant to be run offline:
+        a concurrent reader may briefly see both the merged fragment and the
+        ones it replaces.
+        """
+        await self._compact(threshold)
+
+    def _compact_sync(self, threshold: int) -> None:
+        for directory in self.base_path.glob("source_id=*/frequency=*/module=*"):
+            paths = sorted(directory.glob("*.parquet"))
+
+            if len(paths) <= threshold:
                 continue
 
-            table.drop(measurement_id, axis=0, inplace=True)
-            await self._write_file(source_id, table)
-            return
+            merged = (
+                ds.dataset([str(path) for path in paths], schema=FRAGMENT_SCHEMA)
+                .to_table()
+                .sort_by("time")
+            )
+
+            self._write_fragment_sync(directory, merged)
+
+            for path in paths:
+                path.unlink()
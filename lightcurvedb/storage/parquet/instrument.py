@@ -9,8 +9,15 @@ from lightcurvedb.storage.prototype.instrument import ProvidesInstrumentStorage
 
 
 class PandasInstrumentStorage(ProvidesInstrumentStorage):
+    """
+    Instruments stored in a single parquet file indexed by
+    ``(frequency, module)``. The table is small and read on every catalog
+    lookup, so the parsed frame is kept in memory until the file changes.
+    """
+
     def __init__(self, path: Path):
         self.path = path
+        self._cached: tuple[tuple[int, int], pd.DataFrame] | None = None
 
         self._read_file = asyncify(self._read_file_sync)
         self._write_file = asyncify(self._write_file_sync)
@@ -22,11 +29,22 @@ class PandasInstrumentStorage(ProvidesInstrumentStorage):
         pass
 
     def _read_file_sync(self) -> pd.DataFrame | None:
-        if not self.path.exists():
+        # Callers must not mutate the returned frame; it may be shared.
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
             return None
-        return pd.read_parquet(self.path)
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._cached is None or self._cached[0] != key:
+            self._cached = (key, pd.read_parquet(self.path))
+
+        return self._cached[1]
 
     def _write_file_sync(self, table: pd.DataFrame) -> None:
+        # The file stat catches writes from elsewhere; drop the cache on our
+        # own writes too in case they land within the same mtime tick.
+        self._cached = None
         table.to_parquet(self.path)
 
     async def create(self, instrument: Instrument) -> str:
@@ -88,7 +106,10 @@ class PandasInstrumentStorage(ProvidesInstrumentStorage):
         if (table := await self._read_file()) is None:
             return []
 
-        return [Instrument.model_validate(row.to_dict()) for _, row in table.iterrows()]
+        return [
+            Instrument.model_validate(record)
+            for record in table.to_dict(orient="records")
+        ]
 
     async def delete(self, frequency: int, module: str) -> None:
         """
@@ -98,7 +119,7 @@ class PandasInstrumentStorage(ProvidesInstrumentStorage):
             return
 
         try:
-            table.drop((frequency, module), axis=0, inplace=True)
+            table = table.drop((frequency, module), axis=0)
         except KeyError:
             raise InstrumentNotFoundException(
                 f"Instrument with frequency {frequency} and module {module} not found"
@@ -4,12 +4,14 @@ Provider for lightcurves from pandas data stores.
 
 from __future__ import annotations
 
-import asyncio
 import datetime
 from typing import Literal, overload
 from uuid import UUID
 
+import numpy as np
 import pandas as pd
+import pyarrow.dataset as ds
+from asyncer import asyncify
 
 from lightcurvedb.models.lightcurves import (
     BinnedFrequencyLightcurve,
@@ -21,10 +23,110 @@ from lightcurvedb.models.lightcurves import (
     SourceLightcurveFrequency,
     SourceLightcurveInstrument,
 )
-from lightcurvedb.storage.parquet.flux import PandasFluxMeasurementStorage
+from lightcurvedb.storage.parquet.flux import PandasFluxMeasurementStorage, as_utc
 from lightcurvedb.storage.prototype.lightcurves import ProvidesLightcurves
 
 
+def time_window(
+    start_time: datetime.datetime, end_time: datetime.datetime
+) -> ds.Expression:
+    """
+    Scan predicate for measurements in ``[start_time, end_time)``.
+    """
+    return (ds.field("time") >= as_utc(start_time)) & (
+        ds.field("time") < as_utc(end_time)
+    )
+
+
+def bin_sums(
+    index: np.ndarray, n_bins: int, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per-bin sums and counts of the non-NaN entries of each row of
+    ``values`` (shape ``(columns, rows)``), given each row's bin number.
+    """
+    sums = np.zeros((values.shape[0], n_bins))
+    counts = np.zeros((values.shape[0], n_bins), dtype=np.int64)
+
+    for column in range(values.shape[0]):
+        valid = ~np.isnan(values[column])
+        sums[column] = np.bincount(
+            index[valid], weights=values[column][valid], minlength=n_bins
+        )
+        counts[column] = np.bincount(index[valid], minlength=n_bins)
+
+    return sums, counts
+
+
+def _bin_sums_loop(
+    index: np.ndarray, n_bins: int, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    sums = np.zeros((values.shape[0], n_bins))
+    counts = np.zeros((values.shape[0], n_bins), dtype=np.int64)
+
+    for row in range(index.shape[0]):
+        for column in range(values.shape[0]):
+            value = values[column, row]
+            if not np.isnan(value):
+                sums[column, index[row]] += value
+                counts[column, index[row]] += 1
+
+    return sums, counts
+
+
+try:
+    import numba
+
+    # With the optional numba extra installed, accumulate every column in a
+    # single compiled pass over the rows instead of one bincount per column.
+    # The GIL is released so binning on concurrent worker threads overlaps.
+    bin_sums = numba.njit(cache=True, nogil=True)(_bin_sums_loop)
+except ImportError:
+    pass
+
+
+def float_list(values: pd.Series) -> list[float]:
+    """
+    Unbox a numeric column into Python floats in a single call.
+    """
+    return values.to_numpy(dtype=float).tolist()
+
+
+def optional_float_list(values: pd.Series) -> list[float | None]:
+    """
+    Unbox a numeric column into Python floats, with missing values as None.
+    """
+    array = values.to_numpy(dtype=float, na_value=np.nan)
+    unboxed = array.tolist()
+
+    # Find the gaps with one vectorized scan and patch only those entries.
+    for position in np.flatnonzero(np.isnan(array)).tolist():
+        unboxed[position] = None
+
+    return unboxed
+
+
+INSTRUMENT_COLUMNS = [
+    "measurement_id",
+    "time",
+    "ra",
+    "dec",
+    "flux",
+    "flux_err",
+    "extra",
+]
+FREQUENCY_COLUMNS = [*INSTRUMENT_COLUMNS, "module"]
+SOURCE_COLUMNS = [*FREQUENCY_COLUMNS, "frequency"]
+BINNED_COLUMNS = ["time", "ra", "dec", "flux", "flux_err"]
+BINNED_SOURCE_COLUMNS = [*BINNED_COLUMNS, "module", "frequency"]
+
+BIN_FREQ = {
+    "1 day": "1D",
+    "7 days": "7D",
+    "30 days": "30D",
+}
+
+
 class PandasLightcurves(ProvidesLightcurves):
     """
     Provides lightcurves from a PostgreSQL data store.
@@ -33,57 +135,182 @@ class PandasLightcurves(ProvidesLightcurves):
     def __init__(self, flux_storage: PandasFluxMeasurementStorage):
         self.flux_storage = flux_storage
 
+        # Build all of a source's lightcurves in one worker-thread call
+        # rather than one hop per lightcurve, keeping the event loop free.
+        self._frequency_lightcurves = asyncify(self._frequency_lightcurves_sync)
+        self._instrument_lightcurves = asyncify(self._instrument_lightcurves_sync)
+        self._binned_frequency_lightcurves = asyncify(
+            self._binned_frequency_lightcurves_sync
+        )
+        self._binned_instrument_lightcurves = asyncify(
+            self._binned_instrument_lightcurves_sync
+        )
+
     async def setup(self) -> None:
         """
         Set up the instrument storage system (e.g. create the tables).
         """
         return None
 
-    def _normalize_times(self, values: list) -> list[datetime.datetime]:
-        times: list[datetime.datetime] = []
-        for value in values:
-            if isinstance(value, pd.Timestamp):
-                dt = value.to_pydatetime()
-            else:
-                dt = value
-            if isinstance(dt, datetime.datetime) and dt.tzinfo is None:
-                dt = dt.replace(tzinfo=datetime.timezone.utc)
-            times.append(dt)
-        return times
-
-    def _bin_freq(self, binning_strategy: Literal["1 day", "7 days", "30 days"]) -> str:
-        return {
-            "1 day": "1D",
-            "7 days": "7D",
-            "30 days": "30D",
-        }[binning_strategy]
-
-    def _rolling_binned_table(self, subset: pd.DataFrame, freq: str) -> pd.DataFrame:
+    def _normalize_times(self, values: pd.Series) -> list[datetime.datetime]:
+        # Times are stored as UTC timestamps and bin centres are built in
+        # UTC, so the column needs no re-parsing; tz_convert only swaps the
+        # zone object on the dtype so the boxed values carry timezone.utc.
+        return (
+            pd.DatetimeIndex(values)
+            .tz_convert(datetime.timezone.utc)
+            .to_pydatetime()
+            .tolist()
+        )
+
+    def _split_source_table(
+        self, table: pd.DataFrame | None, by: str | list[str], keys: list
+    ) -> list[pd.DataFrame | None]:
+        """
+        Split a source table into one frame per key with a single groupby
+        pass. Keys with no rows get an empty frame.
+        """
+        if table is None:
+            return [None] * len(keys)
+
+        groups = dict(iter(table.groupby(by, sort=False)))
+        empty = table.iloc[:0]
+
+        return [groups.get(key, empty) for key in keys]
+
+    def _frequency_lightcurves_sync(
+        self,
+        source_id: UUID,
+        frequencies: list[int],
+        table: pd.DataFrame | None,
+        limit: int | None,
+    ) -> list[FrequencyLightcurve]:
+        return [
+            self._frequency_lightcurve(source_id, frequency, group, limit)
+            for frequency, group in zip(
+                frequencies, self._split_source_table(table, "frequency", frequencies)
+            )
+        ]
+
+    def _instrument_lightcurves_sync(
+        self,
+        source_id: UUID,
+        module_frequency_pairs: list[tuple[str, int]],
+        table: pd.DataFrame | None,
+        limit: int | None,
+    ) -> list[InstrumentLightcurve]:
+        return [
+            self._instrument_lightcurve(source_id, module, frequency, group, limit)
+            for (module, frequency), group in zip(
+                module_frequency_pairs,
+                self._split_source_table(
+                    table, ["module", "frequency"], module_frequency_pairs
+                ),
+            )
+        ]
+
+    def _binned_frequency_lightcurves_sync(
+        self,
+        source_id: UUID,
+        frequencies: list[int],
+        binning_strategy: Literal["1 day", "7 days", "30 days"],
+        start_time: datetime.datetime,
+        end_time: datetime.datetime,
+        table: pd.DataFrame | None,
+        limit: int | None,
+    ) -> list[BinnedFrequencyLightcurve]:
+        return [
+            self._binned_frequency_lightcurve(
+                source_id,
+                frequency,
+                binning_strategy,
+                start_time,
+                end_time,
+                group,
+                limit,
+            )
+            for frequency, group in zip(
+                frequencies, self._split_source_table(table, "frequency", frequencies)
+            )
+        ]
+
+    def _binned_instrument_lightcurves_sync(
+        self,
+        source_id: UUID,
+        module_frequency_pairs: list[tuple[str, int]],
+        binning_strategy: Literal["1 day", "7 days", "30 days"],
+        start_time: datetime.datetime,
+        end_time: datetime.datetime,
+        table: pd.DataFrame | None,
+        limit: int | None,
+    ) -> list[BinnedInstrumentLightcurve]:
+        return [
+            self._binned_instrument_lightcurve(
+                source_id,
+                module,
+                frequency,
+                binning_strategy,
+                start_time,
+                end_time,
+                group,
+                limit,
+            )
+            for (module, frequency), group in zip(
+                module_frequency_pairs,
+                self._split_source_table(
+                    table, ["module", "frequency"], module_frequency_pairs
+                ),
+            )
+        ]
+
+    def _binned_table(
+        self, subset: pd.DataFrame, start_time: datetime.datetime, freq: str
+    ) -> pd.DataFrame:
+        """
+        Bin measurements into fixed-width bins anchored at ``start_time``,
+        as ``date_bin`` does in the PostgreSQL backend: each non-empty bin
+        is reported at its centre with the mean position and flux, and the
+        non-null flux errors combined as ``sqrt(sum(err^2)) / n``.
+
+        All rows of ``subset`` share a bin. For frequency lightcurves this
+        combines the modules, where the PostgreSQL backend reports one bin
+        per module.
+        """
         if subset.empty:
             return subset
 
-        subset = subset.copy()
-        subset["time"] = pd.to_datetime(subset["time"], utc=True)
-        subset = subset.sort_values("time").set_index("time")
-
-        rolling = subset.rolling(window=freq, min_periods=1, center=True)
+        width = pd.Timedelta(freq)
+        origin = pd.Timestamp(as_utc(start_time))
+        # The time column is read as a UTC timestamp, so it needs no parsing.
+        offsets = (subset["time"] - origin) // width
+
+        # Compact bin numbers so that the reductions scale with the number of
+        # occupied bins rather than the width of the window.
+        bins, index = np.unique(offsets.to_numpy(dtype=np.int64), return_inverse=True)
+
+        values = np.vstack(
+            [
+                subset["ra"].to_numpy(dtype=float),
+                subset["dec"].to_numpy(dtype=float),
+                subset["flux"].to_numpy(dtype=float),
+                subset["flux_err"].to_numpy(dtype=float) ** 2,
+            ]
+        )
+        sums, counts = bin_sums(index, len(bins), values)
 
-        def rolling_flux_err(values: pd.Series) -> float | None:
-            cleaned = pd.Series(values).dropna()
-            if cleaned.empty:
-                return None
-            return float((cleaned.pow(2).sum() ** 0.5) / len(cleaned))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+            flux_err = np.sqrt(sums[3]) / counts[3]
 
-        aggregated = pd.DataFrame(
+        return pd.DataFrame(
             {
-                "ra": rolling["ra"].mean(),
-                "dec": rolling["dec"].mean(),
-                "flux": rolling["flux"].mean(),
-                "flux_err": rolling["flux_err"].apply(rolling_flux_err, raw=False),
-            }
-        ).reset_index()
-
-        return aggregated
+                "time": origin + width * bins + width / 2,
+                "ra": means[0],
+                "dec": means[1],
+                "flux": means[2],
+                "flux_err": flux_err,
+            },
+        )
 
     async def get_instrument_lightcurve(
         self, source_id: UUID, module: str, frequency: int, limit: int = 1000000
@@ -91,8 +318,22 @@ class PandasLightcurves(ProvidesLightcurves):
         """
         Get a lightcurve for a specific source, module, and frequency.
         """
-        table = await self.flux_storage._read_file(source_id)
+        table = await self.flux_storage._read_file(
+            source_id,
+            (ds.field("module") == module) & (ds.field("frequency") == frequency),
+            columns=INSTRUMENT_COLUMNS,
+        )
 
+        return self._instrument_lightcurve(source_id, module, frequency, table, limit)
+
+    def _instrument_lightcurve(
+        self,
+        source_id: UUID,
+        module: str,
+        frequency: int,
+        table: pd.DataFrame | None,
+        limit: int | None,
+    ) -> InstrumentLightcurve:
         if table is None:
             return InstrumentLightcurve(
                 module=module,
@@ -100,24 +341,22 @@ class PandasLightcurves(ProvidesLightcurves):
                 source_id=source_id,
             )
 
-        filtered = table[
-            (table["module"] == module) & (table["frequency"] == frequency)
-        ].sort_values("time")
-
-        if limit is not None:
-            filtered = filtered.head(limit)
+        # Reads come back ordered by time, and splitting keeps that order.
+        filtered = table if limit is None else table.head(limit)
 
-        return InstrumentLightcurve(
+        # The columns come straight from the typed parquet schema, so skip
+        # per-element validation and unbox each column in a single call.
+        return InstrumentLightcurve.model_construct(
             source_id=source_id,
             module=module,
             frequency=frequency,
-            measurement_id=filtered.index.values,
-            time=pd.to_datetime(filtered.time, utc=True),
-            ra=filtered.ra,
-            dec=filtered.dec,
-            flux=filtered.flux,
-            flux_err=filtered.flux_err,
-            extra=filtered.extra,
+            measurement_id=[UUID(bytes=value) for value in filtered.index],
+            time=self._normalize_times(filtered["time"]),
+            ra=float_list(filtered["ra"]),
+            dec=float_list(filtered["dec"]),
+            flux=float_list(filtered["flux"]),
+            flux_err=float_list(filtered["flux_err"]),
+            extra=filtered["extra"].tolist(),
         )
 
     async def get_frequency_lightcurve(
@@ -126,18 +365,29 @@ class PandasLightcurves(ProvidesLightcurves):
         """
         Get a lightcurve for a specific source andd frequency, for all modules.
         """
-        table = await self.flux_storage._read_file(source_id)
+        table = await self.flux_storage._read_file(
+            source_id,
+            ds.field("frequency") == frequency,
+            columns=FREQUENCY_COLUMNS,
+        )
+
+        return self._frequency_lightcurve(source_id, frequency, table, limit)
 
+    def _frequency_lightcurve(
+        self,
+        source_id: UUID,
+        frequency: int,
+        table: pd.DataFrame | None,
+        limit: int | None,
+    ) -> FrequencyLightcurve:
         if table is None:
             return FrequencyLightcurve(
                 frequency=frequency,
                 source_id=source_id,
             )
 
-        filtered = table[table["frequency"] == frequency].sort_values("time")
-
-        if limit is not None:
-            filtered = filtered.head(limit)
+        # Reads come back ordered by time, and splitting keeps that order.
+        filtered = table if limit is None else table.head(limit)
 
         if filtered.empty:
             return FrequencyLightcurve(
@@ -145,17 +395,19 @@ class PandasLightcurves(ProvidesLightcurves):
                 source_id=source_id,
             )
 
-        return FrequencyLightcurve(
+        # The columns come straight from the typed parquet schema, so skip
+        # per-element validation and unbox each column in a single call.
+        return FrequencyLightcurve.model_construct(
             source_id=source_id,
             frequency=frequency,
-            measurement_id=filtered.index.values,
-            time=pd.to_datetime(filtered.time, utc=True),
-            module=filtered.module,
-            ra=filtered.ra,
-            dec=filtered.dec,
-            flux=filtered.flux,
-            flux_err=filtered.flux_err,
-            extra=filtered.extra,
+            measurement_id=[UUID(bytes=value) for value in filtered.index],
+            time=self._normalize_times(filtered["time"]),
+            module=filtered["module"].tolist(),
+            ra=float_list(filtered["ra"]),
+            dec=float_list(filtered["dec"]),
+            flux=float_list(filtered["flux"]),
+            flux_err=float_list(filtered["flux_err"]),
+            extra=filtered["extra"].tolist(),
         )
 
     async def get_binned_instrument_lightcurve(
@@ -171,8 +423,36 @@ class PandasLightcurves(ProvidesLightcurves):
         """
         Get a binned lightcurve for a specific source, module, and frequency.
         """
-        table = await self.flux_storage._read_file(source_id)
+        table = await self.flux_storage._read_file(
+            source_id,
+            (ds.field("module") == module)
+            & (ds.field("frequency") == frequency)
+            & time_window(start_time, end_time),
+            columns=BINNED_COLUMNS,
+        )
 
+        return self._binned_instrument_lightcurve(
+            source_id,
+            module,
+            frequency,
+            binning_strategy,
+            start_time,
+            end_time,
+            table,
+            limit,
+        )
+
+    def _binned_instrument_lightcurve(
+        self,
+        source_id: UUID,
+        module: str,
+        frequency: int,
+        binning_strategy: Literal["1 day", "7 days", "30 days"],
+        start_time: datetime.datetime,
+        end_time: datetime.datetime,
+        table: pd.DataFrame | None,
+        limit: int | None,
+    ) -> BinnedInstrumentLightcurve:
         if table is None:
             return BinnedInstrumentLightcurve(
                 source_id=source_id,
@@ -183,14 +463,7 @@ class PandasLightcurves(ProvidesLightcurves):
                 end_time=end_time,
             )
 
-        subset = table[
-            (table["module"] == module)
-            & (table["frequency"] == frequency)
-            & (table["time"] >= start_time)
-            & (table["time"] < end_time)
-        ]
-
-        if subset.empty:
+        if table.empty:
             return BinnedInstrumentLightcurve(
                 source_id=source_id,
                 module=module,
@@ -200,8 +473,8 @@ class PandasLightcurves(ProvidesLightcurves):
                 end_time=end_time,
             )
 
-        freq = self._bin_freq(binning_strategy)
-        rolled = self._rolling_binned_table(subset, freq)
+        freq = BIN_FREQ[binning_strategy]
+        rolled = self._binned_table(table, start_time, freq)
 
         if rolled.empty:
             return BinnedInstrumentLightcurve(
@@ -221,19 +494,15 @@ class PandasLightcurves(ProvidesLightcurves):
         if limit is not None:
             rolled = rolled.head(limit)
 
-        flux_err = [
-            None if pd.isna(value) else float(value) for value in rolled["flux_err"]
-        ]
-
-        return BinnedInstrumentLightcurve(
+        return BinnedInstrumentLightcurve.model_construct(
             source_id=source_id,
             module=module,
             frequency=frequency,
-            time=self._normalize_times(rolled["time"].tolist()),
-            ra=rolled["ra"].astype(float).tolist(),
-            dec=rolled["dec"].astype(float).tolist(),
-            flux=rolled["flux"].astype(float).tolist(),
-            flux_err=flux_err,
+            time=self._normalize_times(rolled["time"]),
+            ra=float_list(rolled["ra"]),
+            dec=float_list(rolled["dec"]),
+            flux=float_list(rolled["flux"]),
+            flux_err=optional_float_list(rolled["flux_err"]),
             binning_strategy=binning_strategy,
             start_time=start_time,
             end_time=end_time,
@@ -251,8 +520,32 @@ class PandasLightcurves(ProvidesLightcurves):
         """
         Get a binned lightcurve for a specific source and frequency, for all modules.
         """
-        table = await self.flux_storage._read_file(source_id)
+        table = await self.flux_storage._read_file(
+            source_id,
+            (ds.field("frequency") == frequency) & time_window(start_time, end_time),
+            columns=BINNED_COLUMNS,
+        )
 
+        return self._binned_frequency_lightcurve(
+            source_id,
+            frequency,
+            binning_strategy,
+            start_time,
+            end_time,
+            table,
+            limit,
+        )
+
+    def _binned_frequency_lightcurve(
+        self,
+        source_id: UUID,
+        frequency: int,
+        binning_strategy: Literal["1 day", "7 days", "30 days"],
+        start_time: datetime.datetime,
+        end_time: datetime.datetime,
+        table: pd.DataFrame | None,
+        limit: int | None,
+    ) -> BinnedFrequencyLightcurve:
         if table is None:
             return BinnedFrequencyLightcurve(
                 source_id=source_id,
@@ -262,13 +555,7 @@ class PandasLightcurves(ProvidesLightcurves):
                 end_time=end_time,
             )
 
-        subset = table[
-            (table["frequency"] == frequency)
-            & (table["time"] >= start_time)
-            & (table["time"] < end_time)
-        ]
-
-        if subset.empty:
+        if table.empty:
             return BinnedFrequencyLightcurve(
                 source_id=source_id,
                 frequency=frequency,
@@ -282,8 +569,8 @@ class PandasLightcurves(ProvidesLightcurves):
                 end_time=end_time,
             )
 
-        freq = self._bin_freq(binning_strategy)
-        rolled = self._rolling_binned_table(subset, freq)
+        freq = BIN_FREQ[binning_strategy]
+        rolled = self._binned_table(table, start_time, freq)
 
         if rolled.empty:
             return BinnedFrequencyLightcurve(
@@ -302,18 +589,14 @@ class PandasLightcurves(ProvidesLightcurves):
         if limit is not None:
             rolled = rolled.head(limit)
 
-        flux_err = [
-            None if pd.isna(value) else float(value) for value in rolled["flux_err"]
-        ]
-
-        return BinnedFrequencyLightcurve(
+        return BinnedFrequencyLightcurve.model_construct(
             source_id=source_id,
             frequency=frequency,
-            time=self._normalize_times(rolled["time"].tolist()),
-            ra=rolled["ra"].astype(float).tolist(),
-            dec=rolled["dec"].astype(float).tolist(),
-            flux=rolled["flux"].astype(float).tolist(),
-            flux_err=flux_err,
+            time=self._normalize_times(rolled["time"]),
+            ra=float_list(rolled["ra"]),
+            dec=float_list(rolled["dec"]),
+            flux=float_list(rolled["flux"]),
+            flux_err=optional_float_list(rolled["flux_err"]),
             binning_strategy=binning_strategy,
             start_time=start_time,
             end_time=end_time,
@@ -323,12 +606,9 @@ class PandasLightcurves(ProvidesLightcurves):
         """
         Get all frequencies for a given source.
         """
-        table = await self.flux_storage._read_file(source_id)
-
-        if table is None:
-            return []
+        partitions = await self.flux_storage._partitions(source_id)
 
-        return sorted(table["frequency"].dropna().unique().tolist())
+        return sorted({frequency for frequency, _ in partitions})
 
     async def get_module_frequency_pairs_for_source(
         self, source_id: UUID
@@ -336,25 +616,9 @@ class PandasLightcurves(ProvidesLightcurves):
         """
         Get all modules for a given source.
         """
-        table = await self.flux_storage._read_file(source_id)
-
-        if table is None:
-            return []
-
-        pairs = (
-            table[["module", "frequency"]]
-            .dropna()
-            .drop_duplicates()
-            .itertuples(index=False, name=None)
-        )
-
-        pairs = (
-            table[["module", "frequency"]]
-            .value_counts(ascending=True)
-            .reset_index(name="count")
-        )
+        partitions = await self.flux_storage._partitions(source_id)
 
-        return [(row.module, row.frequency) for _, row in pairs.iterrows()]
+        return [(module, frequency) for frequency, module in partitions]
 
     @overload
     async def get_source_lightcurve(
@@ -381,13 +645,14 @@ class PandasLightcurves(ProvidesLightcurves):
         """
         Get a lightcurve for a specific source, with the given strategy and binning.
         """
+        # Read the source once and build every lightcurve from the same
+        # table rather than re-reading it per frequency or instrument.
+        table = await self.flux_storage._read_file(source_id, columns=SOURCE_COLUMNS)
+
         if selection_strategy == "frequency":
             frequencies = await self.get_frequencies_for_source(source_id)
-            lightcurves = await asyncio.gather(
-                *[
-                    self.get_frequency_lightcurve(source_id, frequency, limit=limit)
-                    for frequency in frequencies
-                ]
+            lightcurves = await self._frequency_lightcurves(
+                source_id, frequencies, table, limit
             )
             return SourceLightcurveFrequency(
                 source_id=source_id,
@@ -399,13 +664,8 @@ class PandasLightcurves(ProvidesLightcurves):
             module_frequency_pairs = await self.get_module_frequency_pairs_for_source(
                 source_id
             )
-            lightcurves = await asyncio.gather(
-                *[
-                    self.get_instrument_lightcurve(
-                        source_id, module, frequency, limit=limit
-                    )
-                    for module, frequency in module_frequency_pairs
-                ]
+            lightcurves = await self._instrument_lightcurves(
+                source_id, module_frequency_pairs, table, limit
             )
             return SourceLightcurveInstrument(
                 source_id=source_id,
@@ -450,20 +710,26 @@ class PandasLightcurves(ProvidesLightcurves):
         """
         Get a binned lightcurve for a specific source, with the given strategy and binning.
         """
+        # Read the window once and bin every lightcurve from the same table
+        # rather than re-reading it per frequency or instrument. The keys come
+        # from the whole source so that bands with no data in the window
+        # still get an (empty) lightcurve.
+        table = await self.flux_storage._read_file(
+            source_id,
+            time_window(start_time, end_time),
+            columns=BINNED_SOURCE_COLUMNS,
+        )
+
         if selection_strategy == "frequency":
             frequencies = await self.get_frequencies_for_source(source_id)
-            lightcurves = await asyncio.gather(
-                *[
-                    self.get_binned_frequency_lightcurve(
-                        source_id,
-                        frequency,
-                        binning_strategy,
-                        start_time,
-                        end_time,
-                        limit=limit,
-                    )
-                    for frequency in frequencies
-                ]
+            lightcurves = await self._binned_frequency_lightcurves(
+                source_id,
+                frequencies,
+                binning_strategy,
+                start_time,
+                end_time,
+                table,
+                limit,
             )
             return SourceLightcurveBinnedFrequency(
                 source_id=source_id,
@@ -477,19 +743,14 @@ class PandasLightcurves(ProvidesLightcurves):
             module_frequency_pairs = await self.get_module_frequency_pairs_for_source(
                 source_id
             )
-            lightcurves = await asyncio.gather(
-                *[
-                    self.get_binned_instrument_lightcurve(
-                        source_id,
-                        module,
-                        frequency,
-                        binning_strategy,
-                        start_time,
-                        end_time,
-                        limit=limit,
-                    )
-                    for module, frequency in module_frequency_pairs
-                ]
+            lightcurves = await self._binned_instrument_lightcurves(
+                source_id,
+                module_frequency_pairs,
+                binning_strategy,
+                start_time,
+                end_time,
+                table,
+                limit,
             )
             return SourceLightcurveBinnedInstrument(
                 source_id=source_id,
@@ -0,0 +1,74 @@
+"""
+SQLite sidecar indexes mapping record IDs to the source that holds them,
+so that deletes only search one source's fragments.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable, Literal
+
+INDEX_TIMEOUT = 60.0
+"""
+Seconds a sidecar connection waits for another writer's lock before
+giving up. Writes from this process are serialized by a lock; this bounds
+the wait on writers in other processes.
+"""
+
+
+class SidecarIndex:
+    """
+    A single ``table`` of ``(record ID, source ID)`` rows in the SQLite
+    database at ``path``. All methods block, and are meant to be called from
+    the storages' worker threads.
+
+    Entries are written before the fragments holding their rows are
+    published. An interrupted insert may therefore leave entries for rows
+    that were never stored, which only send a later delete of that ID to a
+    source without it, but never leaves a stored row unindexed.
+    """
+
+    def __init__(self, path: Path, table: str, key_type: Literal["BLOB", "TEXT"]):
+        self.path = path
+        self.table = table
+        self.key_type = key_type
+
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=INDEX_TIMEOUT)
+
+    def create(self) -> None:
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    measurement_id {self.key_type} PRIMARY KEY,
+                    source_id TEXT NOT NULL
+                )
+                """
+            )
+
+    def insert(self, entries: Iterable[tuple[bytes | str, str]]) -> None:
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?)", entries
+            )
+
+    def source(self, key: bytes | str) -> str | None:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                f"SELECT source_id FROM {self.table} WHERE measurement_id = ?",
+                (key,),
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def remove(self, key: bytes | str) -> None:
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                f"DELETE FROM {self.table} WHERE measurement_id = ?", (key,)
+            )
@@ -1,49 +1,161 @@
 from pathlib import Path
 from uuid import UUID
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from asyncer import asyncify
+from pydantic import TypeAdapter
+from uuid_extensions import uuid7
 
 from lightcurvedb.models import Source
 from lightcurvedb.models.exceptions import SourceNotFoundException
 from lightcurvedb.storage.prototype.source import ProvidesSourceStorage
 
+# Parquet writers don't natively support UUIDs.
+# Use strings, they're friendlier (though less compact) than bytes.
+SOURCE_TABLE_SCHEMA = pa.schema(
+    [
+        ("source_id", pa.string()),
+        ("socat_id", pa.int64()),
+        ("name", pa.string()),
+        ("ra", pa.float64()),
+        ("dec", pa.float64()),
+        ("variable", pa.bool_()),
+        (
+            "extra",
+            pa.struct(
+                [
+                    (
+                        "cross_matches",
+                        pa.list_(pa.struct([("name", pa.string())])),
+                    ),
+                    ("socat_id", pa.int64()),
+                ]
+            ),
+        ),
+    ]
+)
+
+# Validates a whole scan's rows in one call rather than one model at a time.
+SOURCE_LIST = TypeAdapter(list[Source])
+
 
 class PandasSourceStorage(ProvidesSourceStorage):
+    """
+    Sources stored as ``base_path/part-*.parquet``. Each insert writes a new
+    fragment, so adding sources never reads or rewrites the ones already
+    stored; lookups push their predicate into a scan over the fragments.
+    A single-file store from earlier versions, ``base_path.parquet``, is
+    converted into a fragment by ``setup``.
+    """
+
     def __init__(self, path: Path):
-        self.path = path
+        if path.suffix == ".parquet":
+            path = path.with_suffix("")
+
+        self.base_path = path
+        self.legacy_path = path.with_suffix(".parquet")
 
         self._read_file = asyncify(self._read_file_sync)
         self._write_file = asyncify(self._write_file_sync)
+        self._delete = asyncify(self._delete_sync)
 
     async def setup(self):
         """
         Set up the source storage system (e.g. create the tables).
         """
-        pass
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+        if self.legacy_path.is_file():
+            await asyncify(self._migrate_legacy_sync)()
+
+    def _migrate_legacy_sync(self) -> None:
+        # The fragment is published before the legacy file is removed; if
+        # that is interrupted, the fragment already holds every source and
+        # the next setup only has to finish the removal.
+        if not self._fragments():
+            rows = pq.read_table(self.legacy_path).to_pylist()
+            if rows:
+                self._write_fragment_sync(
+                    self._new_table(SOURCE_LIST.validate_python(rows))
+                )
 
-    def _read_file_sync(self) -> pd.DataFrame | None:
-        if not self.path.exists():
+        self.legacy_path.unlink()
+
+    def _fragments(self) -> list[Path]:
+        # Fragment names are time-ordered, so this is insertion order.
+        return sorted(self.base_path.glob("part-*.parquet"))
+
+    def _read_file_sync(self, filter: ds.Expression | None = None) -> list[dict] | None:
+        if not (fragments := self._fragments()):
             return None
-        return pd.read_parquet(self.path)
 
-    def _write_file_sync(self, table: pd.DataFrame) -> None:
-        table.to_parquet(self.path)
+        return (
+            ds.dataset(
+                [str(fragment) for fragment in fragments],
+                schema=SOURCE_TABLE_SCHEMA,
+                format="parquet",
+            )
+            .to_table(filter=filter)
+            .to_pylist()
+        )
+
+    def _write_file_sync(self, table: pa.Table) -> None:
+        self._write_fragment_sync(table)
+
+    def _write_fragment_sync(self, table: pa.Table) -> None:
+        # Write under a temporary name and rename into place so readers
+        # never see a partial fragment.
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+        name = f"part-{uuid7(as_type='hex')}.parquet"
+        temporary = self.base_path / f".{name}.tmp"
+        pq.write_table(table, temporary)
+        temporary.replace(self.base_path / name)
+
+    def _delete_sync(self, source_id: str) -> None:
+        if not (fragments := self._fragments()):
+            raise SourceNotFoundException("Table not found")
+
+        for path in fragments:
+            table = pq.read_table(path, schema=SOURCE_TABLE_SCHEMA)
+            matches = pc.equal(table["source_id"], source_id)
+            if not pc.any(matches).as_py():
+                continue
+
+            remaining = table.filter(pc.invert(matches))
+            if remaining.num_rows:
+                self._write_fragment_sync(remaining)
+
+            path.unlink()
+            return
+
+        raise SourceNotFoundException(f"Source with ID {source_id} not found")
+
+    def _new_table(self, sources: list[Source]) -> pa.Table:
+        return pa.Table.from_pydict(
+            {
+                "source_id": [str(source.source_id) for source in sources],
+                "socat_id": [source.socat_id for source in sources],
+                "name": [source.name for source in sources],
+                "ra": [source.ra for source in sources],
+                "dec": [source.dec for source in sources],
+                "variable": [source.variable for source in sources],
+                "extra": [
+                    None if source.extra is None else source.extra.model_dump()
+                    for source in sources
+                ],
+            },
+            schema=SOURCE_TABLE_SCHEMA,
+        )
 
     async def create(self, source: Source) -> UUID:
         """
         Create a new source and return its ID.
         """
-        new_table = pd.DataFrame([source.model_dump()])
-        # Parquet writers don't natively support UUIDs.
-        # Use strings, they're friendlier (though less compact) than bytes.
-        new_table["source_id"] = new_table["source_id"].astype(str)
-        new_table.set_index("source_id", inplace=True)
-
-        if (table := await self._read_file()) is not None:
-            new_table = pd.concat([table, new_table])
-
-        await self._write_file(new_table)
+        await self._write_file(self._new_table([source]))
 
         return source.source_id
 
@@ -51,14 +163,8 @@ class PandasSourceStorage(ProvidesSourceStorage):
         """
         Bulk insert sources, returns created source IDs.
         """
-        new_table = pd.DataFrame([s.model_dump() for s in sources])
-        new_table["source_id"] = new_table["source_id"].astype(str)
-        new_table.set_index("source_id", inplace=True)
-
-        if (table := await self._read_file()) is not None:
-            new_table = pd.concat([table, new_table])
-
-        await self._write_file(new_table)
+        if sources:
+            await self._write_file(self._new_table(sources))
 
         return [source.source_id for source in sources]
 
@@ -66,61 +172,42 @@ class PandasSourceStorage(ProvidesSourceStorage):
         """
         Retrieve source details by ID.
         """
-        if (table := await self._read_file()) is None:
+        if (
+            rows := await self._read_file(ds.field("source_id") == str(source_id))
+        ) is None:
             raise SourceNotFoundException("Table not found")
 
-        try:
-            row = table.loc[str(source_id)]
-        except KeyError:
+        if not rows:
             raise SourceNotFoundException(f"Source with ID {source_id} not found")
 
-        data = row.to_dict()
-        data["source_id"] = str(source_id)
-        return Source.model_validate(data)
+        return Source.model_validate(rows[0])
 
     async def get_by_socat_id(self, socat_id: int) -> Source:
         """
         Retrieve source details by SoCat ID.
         """
-        if (table := await self._read_file()) is None:
+        if (rows := await self._read_file(ds.field("socat_id") == socat_id)) is None:
             raise SourceNotFoundException("Table not found")
 
-        row = table.loc[table["socat_id"] == socat_id]
-
-        if row.empty:
+        if not rows:
             raise SourceNotFoundException(f"Source with SoCat ID {socat_id} not found")
 
-        data = row.iloc[0].to_dict()
-        data["source_id"] = str(row.index[0])
-        return Source.model_validate(data)
+        return Source.model_validate(rows[0])
 
     async def get_all(self) -> list[Source]:
         """
         Retrieve all sources.
         """
-        if (table := await self._read_file()) is None:
+        if (rows := await self._read_file()) is None:
             return []
 
-        sources = []
-        for source_id, row in table.iterrows():
-            data = row.to_dict()
-            data["source_id"] = str(source_id)
-            sources.append(Source.model_validate(data))
-        return sources
+        return SOURCE_LIST.validate_python(rows)
 
     async def delete(self, source_id: UUID) -> None:
         """
         Delete a source by ID.
         """
-        if (table := await self._read_file()) is None:
-            raise SourceNotFoundException("Table not found")
-
-        try:
-            table.drop(str(source_id), axis=0, inplace=True)
-        except KeyError:
-            raise SourceNotFoundException(f"Source with ID {source_id} not found")
-
-        await self._write_file(table)
+        await self._delete(str(source_id))
 
     async def get_in_bounds(
         self, ra_min: float, ra_max: float, dec_min: float, dec_max: float
@@ -128,19 +215,14 @@ class PandasSourceStorage(ProvidesSourceStorage):
         """
         Retrieve sources within specified RA/Dec bounds.
         """
-        if (table := await self._read_file()) is None:
+        rows = await self._read_file(
+            (ds.field("ra") >= ra_min)
+            & (ds.field("ra") <= ra_max)
+            & (ds.field("dec") >= dec_min)
+            & (ds.field("dec") <= dec_max)
+        )
+
+        if rows is None:
             return []
 
-        in_bounds = table[
-            (table["ra"] >= ra_min)
-            & (table["ra"] <= ra_max)
-            & (table["dec"] >= dec_min)
-            & (table["dec"] <= dec_max)
-        ]
-
-        sources = []
-        for source_id, row in in_bounds.iterrows():
-            data = row.to_dict()
-            data["source_id"] = str(source_id)
-            sources.append(Source.model_validate(data))
-        return sources
+        return SOURCE_LIST.validate_python(rows)
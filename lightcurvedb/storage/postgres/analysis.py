@@ -2,7 +2,6 @@
 Analysis of flux measurements and lightcurves.
 """
 
-import asyncio
 from datetime import datetime
 from uuid import UUID
 
@@ -14,6 +13,96 @@ from lightcurvedb.storage.postgres.flux import PostgresFluxMeasurementStorage
 from lightcurvedb.storage.postgres.lightcurves import PostgresLightcurveProvider
 from lightcurvedb.storage.prototype.analysis import ProvidesAnalysis
 
+STATISTICS_AGGREGATES = """
+    COUNT(*) as measurement_count,
+    MIN(flux) as min_flux,
+    MAX(flux) as max_flux,
+    AVG(flux) as mean_flux,
+    STDDEV(flux) as stddev_flux,
+    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY flux) as median_flux,
+    SUM(flux * inverse_variance) / NULLIF(SUM(inverse_variance), 0)
+        AS weighted_mean_flux,
+    1.0 / SQRT(NULLIF(SUM(inverse_variance), 0))
+        AS weighted_error_on_mean_flux,
+    MIN(time) as start_time,
+    MAX(time) as end_time
+"""
+
+
+# Each query below has one fixed text per combination of optional time
+# bounds, so PostgreSQL can reuse its prepared plan for each, and the
+# bounds are plain range predicates the time index and partition pruning
+# can use. Keyed by whether the start and end times are given.
+WINDOW_BOUNDS = [(False, False), (True, False), (False, True), (True, True)]
+
+
+def source_window(has_start: bool, has_end: bool) -> str:
+    window = "source_id = %(source_id)s"
+
+    if has_start:
+        window += " AND time >= %(start_time)s"
+
+    if has_end:
+        window += " AND time <= %(end_time)s"
+
+    return window
+
+
+def pair_statistics_query(has_start: bool, has_end: bool) -> str:
+    return f"""
+        SELECT
+            %(source_id)s as source_id,
+            %(module)s as module,
+            %(frequency)s as frequency,
+            {STATISTICS_AGGREGATES}
+        FROM (
+            SELECT
+                time,
+                flux,
+                1.0 / NULLIF(flux_err * flux_err, 0) AS inverse_variance
+            FROM flux_measurements
+            WHERE {source_window(has_start, has_end)}
+                AND frequency = %(frequency)s
+                AND (%(module)s::text = 'all' OR module = %(module)s)
+        ) AS measurements
+    """
+
+
+def grouped_statistics_query(
+    module_col: str, group_by: str, has_start: bool, has_end: bool
+) -> str:
+    return f"""
+        SELECT
+            %(source_id)s as source_id,
+            {module_col} as module,
+            frequency,
+            {STATISTICS_AGGREGATES}
+        FROM (
+            SELECT
+                module,
+                frequency,
+                time,
+                flux,
+                1.0 / NULLIF(flux_err * flux_err, 0) AS inverse_variance
+            FROM flux_measurements
+            WHERE {source_window(has_start, has_end)}
+        ) AS measurements
+        GROUP BY {group_by}
+    """
+
+
+PAIR_STATISTICS_QUERIES = {
+    bounds: pair_statistics_query(*bounds) for bounds in WINDOW_BOUNDS
+}
+MODULE_STATISTICS_QUERIES = {
+    bounds: grouped_statistics_query("module", "module, frequency", *bounds)
+    for bounds in WINDOW_BOUNDS
+}
+FREQUENCY_STATISTICS_QUERIES = {
+    bounds: grouped_statistics_query("'all'", "frequency", *bounds)
+    for bounds in WINDOW_BOUNDS
+}
+
 
 class PostgresAnalysisProvider(ProvidesAnalysis):
     async def setup(self) -> None:
@@ -48,48 +137,14 @@ class PostgresAnalysisProvider(ProvidesAnalysis):
         Supports "module = 'all'" to get statistics across all modules for the
         given frequency.
         """
-        where_clauses = [
-            "source_id = %(source_id)s",
-            "frequency = %(frequency)s",
-        ]
-        params: dict[str, int | str | datetime | UUID] = {
+        params = {
             "source_id": source_id,
+            "module": module,
             "frequency": frequency,
+            "start_time": start_time,
+            "end_time": end_time,
         }
 
-        if start_time is not None:
-            where_clauses.append("time >= %(start_time)s")
-            params["start_time"] = start_time
-        if end_time is not None:
-            where_clauses.append("time <= %(end_time)s")
-            params["end_time"] = end_time
-        if module != "all":
-            where_clauses.append("module = %(module)s")
-            params["module"] = module
-
-        module_col = "%(module)s" if module != "all" else "'all'"
-        query = f"""
-            SELECT
-                %(source_id)s as source_id,
-                {module_col} as module,
-                %(frequency)s as frequency,
-                COUNT(*) as measurement_count,
-                MIN(flux) as min_flux,
-                MAX(flux) as max_flux,
-                AVG(flux) as mean_flux,
-                STDDEV(flux) as stddev_flux,
-                PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY flux) as median_flux,
-                SUM(flux / NULLIF(POWER(flux_err, 2), 0)) /
-                    NULLIF(SUM(1.0 / NULLIF(POWER(flux_err, 2), 0)), 0)
-                    AS weighted_mean_flux,
-                1.0 / SQRT(NULLIF(SUM(1.0 / NULLIF(POWER(flux_err, 2), 0)), 0))
-                    AS weighted_error_on_mean_flux,
-                MIN(time) as start_time,
-                MAX(time) as end_time
-            FROM flux_measurements
-            WHERE {" AND ".join(where_clauses)}
-        """
-
         with self.tracer.start_as_current_span(
             "get_source_statistics_for_frequency_and_module",
             attributes={
@@ -103,7 +158,12 @@ class PostgresAnalysisProvider(ProvidesAnalysis):
             async with self.flux_storage.cursor(
                 row_factory=class_row(SourceStatistics)
             ) as cur:
-                await cur.execute(query, params)
+                await cur.execute(
+                    PAIR_STATISTICS_QUERIES[
+                        start_time is not None, end_time is not None
+                    ],
+                    params,
+                )
                 row = await cur.fetchone()
                 if row is None:
                     span.set_status(trace.Status(trace.StatusCode.ERROR))
@@ -139,6 +199,8 @@ class PostgresAnalysisProvider(ProvidesAnalysis):
     ) -> dict[str, SourceStatistics]:
         """
         Get source statistics across all frequencies and modules.
+        Combinations with no measurements inside the time window are
+        omitted.
         """
 
         with self.tracer.start_as_current_span(
@@ -150,28 +212,26 @@ class PostgresAnalysisProvider(ProvidesAnalysis):
                 "end_time": end_time,
             },
         ) as span:
-            module_frequency_pairs = (
-                await self.lightcurve_provider.get_module_frequency_pairs_for_source(
-                    source_id=source_id
-                )
+            # One grouped scan computes every combination, rather than a
+            # separate query (and round-trip) per module/frequency pair.
+            queries = (
+                FREQUENCY_STATISTICS_QUERIES
+                if collate_modules
+                else MODULE_STATISTICS_QUERIES
             )
+            query = queries[start_time is not None, end_time is not None]
+            params = {
+                "source_id": source_id,
+                "start_time": start_time,
+                "end_time": end_time,
+            }
+
+            async with self.flux_storage.cursor(
+                row_factory=class_row(SourceStatistics)
+            ) as cur:
+                await cur.execute(query, params)
+                statistics = await cur.fetchall()
 
-            if collate_modules:
-                unique_frequencies = set(pair[1] for pair in module_frequency_pairs)
-                module_frequency_pairs = [("all", freq) for freq in unique_frequencies]
-
-            statistics = await asyncio.gather(
-                *[
-                    self.get_source_statistics_for_frequency_and_module(
-                        source_id=source_id,
-                        module=module,
-                        frequency=frequency,
-                        start_time=start_time,
-                        end_time=end_time,
-                    )
-                    for module, frequency in module_frequency_pairs
-                ]
-            )
             span.set_attribute("lcs:num_statistics", len(statistics))
 
             if collate_modules:
@@ -14,6 +14,7 @@ from lightcurvedb.storage.postgres.cutout import PostgresCutoutStorage
 from lightcurvedb.storage.postgres.flux import PostgresFluxMeasurementStorage
 from lightcurvedb.storage.postgres.instrument import PostgresInstrumentStorage
 from lightcurvedb.storage.postgres.lightcurves import PostgresLightcurveProvider
+from lightcurvedb.storage.postgres.pooler import connection_configurator
 from lightcurvedb.storage.postgres.source import PostgresSourceStorage
 from lightcurvedb.storage.prototype.backend import Backend
 
@@ -59,6 +60,12 @@ async def postgres_backend(settings: Settings) -> AsyncIterator[Backend]:
     except ImportError:
         pass
 
-    async with AsyncConnectionPool(conninfo=settings.database_url) as conn:
+    async with AsyncConnectionPool(
+        conninfo=settings.database_url,
+        min_size=settings.postgres_pool_min_size,
+        max_size=settings.postgres_pool_max_size,
+        configure=connection_configurator(settings),
+        open=False,
+    ) as conn:
         backend = await generate_postgres_backend(conn)
         yield backend
@@ -4,21 +4,41 @@ PostgreSQL implementation of FluxMeasurementStorage protocol.
 
 import csv
 import json
-from collections import defaultdict
 from io import BytesIO, StringIO
 from typing import Literal
 from uuid import UUID
 
 import pydantic
 from psycopg.rows import class_row
-from uuid_extensions import uuid7
 
 from lightcurvedb.config import settings
 from lightcurvedb.models.flux import FluxMeasurement
+from lightcurvedb.storage.ingest import validate_positions
 from lightcurvedb.storage.postgres.pooler import PostgresPoolUser
-from lightcurvedb.storage.postgres.schema import FLUX_INDEXES, FLUX_MEASUREMENTS_TABLE
+from lightcurvedb.storage.postgres.schema import (
+    FLUX_INDEXES,
+    FLUX_MEASUREMENTS_TABLE,
+    FLUX_MIGRATION,
+    generate_flux_partitions,
+    rename_unpartitioned_table,
+)
 from lightcurvedb.storage.prototype.flux import ProvidesFluxMeasurementStorage
 
+# Flux columns in table order, other than the JSON-encoded extra column.
+UNNEST_FIELDS = (
+    "measurement_id",
+    "frequency",
+    "module",
+    "source_id",
+    "time",
+    "ra",
+    "dec",
+    "ra_uncertainty",
+    "dec_uncertainty",
+    "flux",
+    "flux_err",
+)
+
 
 class PostgresFluxMeasurementStorage(
     PostgresPoolUser,
@@ -29,9 +49,27 @@ class PostgresFluxMeasurementStorage(
     """
 
     async def setup(self) -> None:
+        # Send the table, its partitions and its indexes as one
+        # multi-statement query rather than a round trip each. It runs in a
+        # single transaction, so a table from before partitioning is either
+        # fully moved into the partitioned one or left untouched. The old
+        # table is dropped before the indexes are created, as it holds
+        # indexes with the same names.
+        ddl = ";\n".join(
+            [
+                rename_unpartitioned_table("flux_measurements"),
+                FLUX_MEASUREMENTS_TABLE,
+                generate_flux_partitions(
+                    start_year=settings.flux_partition_start_year,
+                    end_year=settings.flux_partition_end_year,
+                ),
+                FLUX_MIGRATION,
+                FLUX_INDEXES,
+            ]
+        )
+
         async with self.cursor() as cur:
-            await cur.execute(FLUX_MEASUREMENTS_TABLE)
-            await cur.execute(FLUX_INDEXES)
+            await cur.execute(ddl, prepare=False)
 
     async def create(self, measurement: FluxMeasurement) -> UUID:
         """
@@ -89,18 +127,16 @@ class PostgresFluxMeasurementStorage(
                 return await self._insert_batch_data_copy_csv(measurements)
             else:
                 with self.tracer.start_as_current_span("prepare_batch_data_for_unnest"):
-                    data = defaultdict(list)
-
-                    for measurement in measurements:
-                        measurement_dict = measurement.model_dump()
-                        if measurement_dict.get("measurement_id", None) is None:
-                            measurement_dict["measurement_id"] = uuid7()
-                        if measurement_dict["extra"] is not None:
-                            measurement_dict["extra"] = json.dumps(
-                                measurement_dict["extra"]
-                            )
-                        for key, value in measurement_dict.items():
-                            data[key].append(value)
+                    # Pull each column straight from the model attributes
+                    # rather than dumping every measurement to a dict.
+                    data = {
+                        field: [getattr(m, field) for m in measurements]
+                        for field in UNNEST_FIELDS
+                    }
+                    data["extra"] = [
+                        None if m.extra is None else m.extra.model_dump_json()
+                        for m in measurements
+                    ]
 
                 return await self._insert_batch_data(data)
 
@@ -163,7 +199,7 @@ class PostgresFluxMeasurementStorage(
         async with self.cursor() as cur:
             async with cur.copy(f"""
                 COPY flux_measurements (
-                    {", ".join(data[0].model_dump().keys())}
+                    {", ".join(FluxMeasurement.model_fields)}
                 )
                 FROM STDIN WITH (FORMAT CSV)
                 """) as copy:
@@ -173,8 +209,15 @@ class PostgresFluxMeasurementStorage(
                     span.set_attribute("flux.num_measurements", len(data))
                     copy_buffer = StringIO()
                     writer = csv.writer(copy_buffer)
-                    for row in data:
-                        writer.writerow(row.model_dump_sub_as_json().values())
+                    # Read the attributes directly instead of dumping each
+                    # measurement to a dict first.
+                    writer.writerows(
+                        (
+                            *(getattr(row, field) for field in UNNEST_FIELDS),
+                            None if row.extra is None else row.extra.model_dump_json(),
+                        )
+                        for row in data
+                    )
                     span.set_attribute("flux.payload_size_bytes", copy_buffer.tell())
                     copy_buffer.seek(0)
 
@@ -201,7 +244,7 @@ class PostgresFluxMeasurementStorage(
             )
         """
 
-        async with self.cursor() as cur:
+        async with self.cursor(binary=True) as cur:
             await cur.execute(query, data)
 
     async def ingest_dataframe(
@@ -239,6 +282,8 @@ class PostgresFluxMeasurementStorage(
 
         table = pq.read_table(parquet_bytes)
 
+        validate_positions(table["ra"].to_numpy(), table["dec"].to_numpy())
+
         for name in table.schema.names:
             if name in ("measurement_id", "source_id"):
                 # This is temporary
@@ -272,6 +317,8 @@ class PostgresFluxMeasurementStorage(
 
         table = pq.read_table(parquet_bytes)
 
+        validate_positions(table["ra"].to_numpy(), table["dec"].to_numpy())
+
         con = duckdb.connect()  # ONE connection
 
         # register arrow table
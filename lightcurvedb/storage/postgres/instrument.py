@@ -3,21 +3,48 @@ PostgreSQL implementation of BandStorage protocol.
 """
 
 import json
-from collections import defaultdict
+import time
 
+from opentelemetry import metrics, trace
 from psycopg.rows import class_row
+from psycopg_pool import AsyncConnectionPool
 
 from lightcurvedb.models.instrument import Instrument
 from lightcurvedb.storage.postgres.pooler import PostgresPoolUser
 from lightcurvedb.storage.postgres.schema import INSTRUMENTS_TABLE
 from lightcurvedb.storage.prototype.instrument import ProvidesInstrumentStorage
 
+# Seconds a row read by PostgresInstrumentStorage.get is served from memory,
+# bounding how stale it can be after a change made by another process.
+INSTRUMENT_CACHE_TTL = 60.0
+
 
 class PostgresInstrumentStorage(ProvidesInstrumentStorage, PostgresPoolUser):
     """
-    PostgreSQL instrument storage.
+    PostgreSQL instrument storage. Instruments are a small, rarely changing
+    table, so ``get`` keeps the rows it reads for ``INSTRUMENT_CACHE_TTL``
+    seconds; writes and deletes through this storage evict their keys.
+
+    Each key also has a generation, bumped on every eviction. ``get`` only
+    caches a row if the generation is unchanged since before its read, so a
+    read that overlaps a write cannot cache the row as it was before it.
     """
 
+    def __init__(
+        self,
+        pool: AsyncConnectionPool,
+        tracer: trace.Tracer | None = None,
+        meter: metrics.Meter | None = None,
+    ):
+        PostgresPoolUser.__init__(self, pool, tracer=tracer, meter=meter)
+
+        self._cache: dict[tuple[int, str], tuple[float, Instrument]] = {}
+        self._generations: dict[tuple[int, str], int] = {}
+
+    def _evict(self, key: tuple[int, str]) -> None:
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._cache.pop(key, None)
+
     async def setup(self) -> None:
         async with self.cursor() as cur:
             await cur.execute(INSTRUMENTS_TABLE)
@@ -44,9 +71,14 @@ class PostgresInstrumentStorage(ProvidesInstrumentStorage, PostgresPoolUser):
             async with self.cursor() as cur:
                 await cur.execute(query, params)
                 row = await cur.fetchone()
-                if row is None:
-                    raise ValueError("INSERT RETURNING instrument returned no row")
-                return row[0]
+
+            # Evict only once the write has committed, so a concurrent get
+            # cannot re-cache the row as it was before the write.
+            self._evict((instrument.frequency, instrument.module))
+
+            if row is None:
+                raise ValueError("INSERT RETURNING instrument returned no row")
+            return row[0]
 
     async def create_batch(self, instruments: list[Instrument]) -> list[str]:
         """
@@ -68,18 +100,25 @@ class PostgresInstrumentStorage(ProvidesInstrumentStorage, PostgresPoolUser):
         with self.tracer.start_as_current_span("create_batch_instruments") as span:
             span.set_attribute("instrument.num_instruments", len(instruments))
 
-            data = defaultdict(list)
-
-            for instrument in instruments:
-                instrument_dict = instrument.model_dump()
-                for key, value in instrument_dict.items():
-                    if key == "details" and value is not None:
-                        value = json.dumps(value)
-                    data[key].append(value)
+            # Pull each column straight from the model attributes rather
+            # than dumping every instrument to a dict.
+            data = {
+                "frequency": [i.frequency for i in instruments],
+                "module": [i.module for i in instruments],
+                "telescope": [i.telescope for i in instruments],
+                "instrument": [i.instrument for i in instruments],
+                "details": [
+                    None if i.details is None else json.dumps(i.details)
+                    for i in instruments
+                ],
+            }
 
             async with self.cursor() as cur:
                 await cur.execute(query, data)
 
+            for instrument in instruments:
+                self._evict((instrument.frequency, instrument.module))
+
             return [instrument.instrument for instrument in instruments]
 
     async def get(self, frequency: int, module: str) -> Instrument:
@@ -94,6 +133,16 @@ class PostgresInstrumentStorage(ProvidesInstrumentStorage, PostgresPoolUser):
             span.set_attribute("instrument.frequency", frequency)
             span.set_attribute("instrument.module", module)
 
+            cached = self._cache.get((frequency, module))
+            if (
+                cached is not None
+                and time.monotonic() - cached[0] < INSTRUMENT_CACHE_TTL
+            ):
+                span.set_attribute("instrument.cached", True)
+                return cached[1].model_copy(deep=True)
+
+            generation = self._generations.get((frequency, module), 0)
+
             async with self.cursor(row_factory=class_row(Instrument)) as cur:
                 await cur.execute(query, {"frequency": frequency, "module": module})
                 row = await cur.fetchone()
@@ -107,7 +156,10 @@ class PostgresInstrumentStorage(ProvidesInstrumentStorage, PostgresPoolUser):
                         f"Instrument with frequency {frequency} and module {module} not found"
                     )
 
-                return row
+            if self._generations.get((frequency, module), 0) == generation:
+                self._cache[(frequency, module)] = (time.monotonic(), row)
+
+            return row.model_copy(deep=True)
 
     async def get_all(self) -> list[Instrument]:
         """Get all instruments."""
@@ -131,16 +183,23 @@ class PostgresInstrumentStorage(ProvidesInstrumentStorage, PostgresPoolUser):
             span.set_attribute("instrument.frequency", frequency)
             span.set_attribute("instrument.module", module)
 
-            try:
-                await self.get(frequency, module)
-            except Exception:
+            # RETURNING reports whether a row existed in the same round trip,
+            # rather than checking with a separate SELECT first.
+            query = """
+                DELETE FROM instruments
+                WHERE frequency = %(frequency)s AND module = %(module)s
+                RETURNING frequency
+            """
+
+            async with self.cursor() as cur:
+                await cur.execute(query, {"frequency": frequency, "module": module})
+                row = await cur.fetchone()
+
+            self._evict((frequency, module))
+
+            if row is None:
                 from lightcurvedb.models.exceptions import InstrumentNotFoundException
 
                 raise InstrumentNotFoundException(
                     f"Instrument with frequency {frequency} and module {module} not found"
                 )
-
-            query = "DELETE FROM instruments WHERE frequency = %(frequency)s AND module = %(module)s"
-
-            async with self.cursor() as cur:
-                await cur.execute(query, {"frequency": frequency, "module": module})
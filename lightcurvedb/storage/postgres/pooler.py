@@ -3,15 +3,17 @@ A base class providing a set-up employing connection pools to generate
 cursors.
 """
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from typing import Any, overload
 
 from opentelemetry import metrics, trace
-from psycopg import AsyncClientCursor
+from psycopg import AsyncClientCursor, AsyncConnection
 from psycopg.rows import BaseRowFactory, Row
 from psycopg_pool import AsyncConnectionPool
 
+from lightcurvedb.config import Settings
+
 
 class PostgresPoolUser:
     def __init__(
@@ -29,19 +31,39 @@ class PostgresPoolUser:
         self,
         *,
         row_factory: BaseRowFactory[Row],
+        binary: bool = False,
     ) -> AbstractAsyncContextManager[AsyncClientCursor[Row]]: ...
 
     @overload
-    def cursor(self) -> AbstractAsyncContextManager[AsyncClientCursor[Any]]: ...
+    def cursor(
+        self, *, binary: bool = False
+    ) -> AbstractAsyncContextManager[AsyncClientCursor[Any]]: ...
 
     @asynccontextmanager  # type: ignore[misc]
     async def cursor(
-        self, *, row_factory: BaseRowFactory[Row] | None = None
+        self,
+        *,
+        row_factory: BaseRowFactory[Row] | None = None,
+        binary: bool = False,
     ) -> AsyncIterator[AsyncClientCursor[Any]]:
         async with self.pool.connection() as conn:
             if row_factory is not None:
-                async with conn.cursor(row_factory=row_factory) as cur:
+                async with conn.cursor(row_factory=row_factory, binary=binary) as cur:
                     yield cur
             else:
-                async with conn.cursor() as cur:
+                async with conn.cursor(binary=binary) as cur:
                     yield cur
+
+
+def connection_configurator(
+    settings: Settings,
+) -> Callable[[AsyncConnection], Awaitable[None]]:
+    """
+    Build the ``configure`` hook for the connection pool, applied once to
+    each new connection.
+    """
+
+    async def configure(conn: AsyncConnection) -> None:
+        conn.prepare_threshold = settings.postgres_prepare_threshold
+
+    return configure
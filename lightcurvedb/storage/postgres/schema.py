@@ -13,9 +13,24 @@ CREATE TABLE IF NOT EXISTS sources (
     extra JSONB
 );
 
+-- Unit vector of the position scaled by 32400 and stored as INT2, which
+-- keeps the spatial prefilter index at a quarter of its float8 size. Added
+-- separately so that tables created before these columns existed gain them.
+ALTER TABLE sources
+    ADD COLUMN IF NOT EXISTS cxi SMALLINT GENERATED ALWAYS AS (
+        (cos(radians(dec)) * cos(radians(ra)) * 32400)::smallint
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS cyi SMALLINT GENERATED ALWAYS AS (
+        (cos(radians(dec)) * sin(radians(ra)) * 32400)::smallint
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS czi SMALLINT GENERATED ALWAYS AS (
+        (sin(radians(dec)) * 32400)::smallint
+    ) STORED;
+
 CREATE INDEX IF NOT EXISTS idx_sources_name ON sources (name);
 CREATE INDEX IF NOT EXISTS idx_sources_socat_id ON sources (socat_id);
 CREATE INDEX IF NOT EXISTS idx_sources_position ON sources (ra, dec) WHERE ra IS NOT NULL AND dec IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_sources_cxcycz ON sources (cxi, cyi, czi) WHERE cxi IS NOT NULL;
 """
 
 INSTRUMENTS_TABLE = """
@@ -32,7 +47,7 @@ CREATE TABLE IF NOT EXISTS instruments (
 
 FLUX_MEASUREMENTS_TABLE = """
 CREATE TABLE IF NOT EXISTS flux_measurements (
-    measurement_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    measurement_id UUID NOT NULL DEFAULT gen_random_uuid(),
 
     frequency INTEGER NOT NULL,
     module TEXT NOT NULL,
@@ -50,13 +65,119 @@ CREATE TABLE IF NOT EXISTS flux_measurements (
     flux_err REAL,
     extra JSONB,
 
-    FOREIGN KEY (frequency, module) REFERENCES instruments(frequency, module)
-)
+    FOREIGN KEY (frequency, module) REFERENCES instruments(frequency, module),
+
+    -- Unique constraints on a partitioned table must include the partition
+    -- key, so a measurement ID is only unique together with its time:
+    -- inserting an existing ID at a different time adds a second row.
+    PRIMARY KEY (measurement_id, time)
+) PARTITION BY RANGE (time)
 """
 
+
+def rename_unpartitioned_table(table: str) -> str:
+    """
+    Generate the DDL that moves an unpartitioned ``table``, left by a
+    version from before it was range partitioned, out of the way as
+    ``{table}_unpartitioned``. Its primary key is renamed along with it so
+    that the partitioned table can create its own. Does nothing if
+    ``table`` does not exist or is already partitioned.
+    """
+    return f"""
+DO $$
+DECLARE
+    pkey name;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE oid = to_regclass('{table}') AND relkind = 'r'
+    ) THEN
+        SELECT conname INTO pkey FROM pg_constraint
+        WHERE conrelid = '{table}'::regclass AND contype = 'p';
+
+        ALTER TABLE {table} RENAME TO {table}_unpartitioned;
+
+        IF pkey IS NOT NULL THEN
+            EXECUTE format(
+                'ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT %I TO %I',
+                pkey,
+                pkey || '_unpartitioned'
+            );
+        END IF;
+    END IF;
+END
+$$
+"""
+
+
+FLUX_MIGRATION = """
+DO $$
+BEGIN
+    IF to_regclass('flux_measurements_unpartitioned') IS NOT NULL THEN
+        INSERT INTO flux_measurements (
+            measurement_id, frequency, module, source_id, time, ra, dec,
+            ra_uncertainty, dec_uncertainty, flux, flux_err, extra
+        )
+        SELECT
+            measurement_id, frequency, module, source_id, time, ra, dec,
+            ra_uncertainty, dec_uncertainty, flux, flux_err, extra
+        FROM flux_measurements_unpartitioned;
+
+        -- CASCADE drops the foreign key that an unpartitioned cutouts table
+        -- holds on the old table; the cutouts are moved by their own setup.
+        DROP TABLE flux_measurements_unpartitioned CASCADE;
+    END IF;
+END
+$$
+"""
+"""
+Copies the rows of a flux_measurements table set aside by
+rename_unpartitioned_table into the partitioned table, then drops it.
+"""
+
+
+def generate_yearly_partitions(table: str, start_year: int, end_year: int) -> str:
+    """
+    Generate the DDL for yearly range partitions of a table partitioned by
+    time covering [start_year, end_year), along with a default partition
+    that catches any row outside of that range. Partitions can only be added
+    for ranges that have no rows in the default partition.
+    """
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT;"
+    ]
+
+    for year in range(start_year, end_year):
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table}_y{year} "
+            f"PARTITION OF {table} "
+            f"FOR VALUES FROM ('{year}-01-01 00:00:00+00') "
+            f"TO ('{year + 1}-01-01 00:00:00+00');"
+        )
+
+    return "\n".join(statements)
+
+
+def generate_flux_partitions(start_year: int, end_year: int) -> str:
+    """
+    Generate the DDL for yearly range partitions of flux_measurements.
+    """
+    return generate_yearly_partitions("flux_measurements", start_year, end_year)
+
+
+def generate_cutout_partitions(start_year: int, end_year: int) -> str:
+    """
+    Generate the DDL for yearly range partitions of cutouts. Cutouts share
+    their time with the flux measurement they belong to, so they use the
+    same ranges.
+    """
+    return generate_yearly_partitions("cutouts", start_year, end_year)
+
+
+# Indexes on the partitioned table are created on every partition.
 FLUX_INDEXES = """
-CREATE INDEX IF NOT EXISTS idx_flux_source_id
-    ON flux_measurements (source_id);
+CREATE INDEX IF NOT EXISTS idx_flux_source_frequency_module_time
+    ON flux_measurements (source_id, frequency, module, time DESC);
 
 CREATE INDEX IF NOT EXISTS idx_flux_time
     ON flux_measurements (time DESC);
@@ -64,7 +185,7 @@ CREATE INDEX IF NOT EXISTS idx_flux_time
 
 CUTOUT_SCHEMA = """
 CREATE TABLE IF NOT EXISTS cutouts (
-    measurement_id UUID PRIMARY KEY REFERENCES flux_measurements(measurement_id),
+    measurement_id UUID NOT NULL,
 
     source_id UUID REFERENCES sources(source_id),
 
@@ -75,11 +196,44 @@ CREATE TABLE IF NOT EXISTS cutouts (
     time TIMESTAMPTZ NOT NULL,
     units TEXT NOT NULL,
 
-    FOREIGN KEY (frequency, module) REFERENCES instruments(frequency, module)
-)
+    FOREIGN KEY (measurement_id, time)
+        REFERENCES flux_measurements(measurement_id, time),
+    FOREIGN KEY (frequency, module) REFERENCES instruments(frequency, module),
+
+    PRIMARY KEY (measurement_id, time)
+) PARTITION BY RANGE (time)
+"""
+
+CUTOUT_MIGRATION = """
+DO $$
+BEGIN
+    IF to_regclass('cutouts_unpartitioned') IS NOT NULL THEN
+        -- Take the time from the flux measurement, which the partitioned
+        -- table's foreign key requires to match.
+        INSERT INTO cutouts (
+            measurement_id, source_id, frequency, module, data, time, units
+        )
+        SELECT
+            c.measurement_id, c.source_id, c.frequency, c.module, c.data,
+            f.time, c.units
+        FROM cutouts_unpartitioned c
+        JOIN flux_measurements f ON f.measurement_id = c.measurement_id;
+
+        DROP TABLE cutouts_unpartitioned;
+    END IF;
+END
+$$
+"""
+"""
+Copies the rows of a cutouts table set aside by rename_unpartitioned_table
+into the partitioned table, then drops it. Runs after the flux measurements
+have been migrated.
 """
 
 CUTOUT_INDEXES = """
 CREATE INDEX IF NOT EXISTS idx_cutouts_measurement_id
     ON cutouts (measurement_id);
+
+CREATE INDEX IF NOT EXISTS idx_cutouts_source_id
+    ON cutouts (source_id);
 """
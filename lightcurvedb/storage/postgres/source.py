@@ -3,7 +3,7 @@ PostgreSQL implementation of SourceStorage protocol.
 """
 
 import json
-from collections import defaultdict
+import math
 from uuid import UUID
 
 from psycopg.rows import class_row
@@ -13,6 +13,68 @@ from lightcurvedb.storage.postgres.pooler import PostgresPoolUser
 from lightcurvedb.storage.postgres.schema import SOURCES_TABLE
 from lightcurvedb.storage.prototype.source import ProvidesSourceStorage
 
+# Scale applied to the unit vector components stored in the cxi, cyi, czi
+# columns; must match the generated columns in SOURCES_TABLE.
+UNIT_VECTOR_SCALE = 32400
+
+
+def _unit_vector(ra: float, dec: float) -> tuple[float, float, float]:
+    ra_rad = math.radians(ra)
+    dec_rad = math.radians(dec)
+    return (
+        math.cos(dec_rad) * math.cos(ra_rad),
+        math.cos(dec_rad) * math.sin(ra_rad),
+        math.sin(dec_rad),
+    )
+
+
+def _unit_vector_bounds(
+    center: tuple[float, float, float], radius: float
+) -> list[tuple[int, int]]:
+    """
+    Integer bounding cube, in the scaled units of the cxi, cyi, czi columns,
+    of all unit vectors within `radius` degrees of `center`. Padded by one
+    unit to absorb the rounding of the generated columns.
+    """
+    radius_rad = math.radians(radius)
+    bounds = []
+    for component in center:
+        angle = math.acos(max(-1.0, min(1.0, component)))
+        low = math.cos(min(math.pi, angle + radius_rad))
+        high = math.cos(max(0.0, angle - radius_rad))
+        bounds.append(
+            (
+                math.floor(low * UNIT_VECTOR_SCALE) - 1,
+                math.ceil(high * UNIT_VECTOR_SCALE) + 1,
+            )
+        )
+    return bounds
+
+
+def cone_search_parameters(ra: float, dec: float, radius: float) -> dict[str, float]:
+    """
+    Query parameters for a cone search of `radius` degrees around (ra, dec):
+    the centre's unit vector, its integer bounding cube for the cxi, cyi, czi
+    index, and the cosine of the radius for the exact refinement.
+    """
+    center = _unit_vector(ra, dec)
+    (cx_min, cx_max), (cy_min, cy_max), (cz_min, cz_max) = _unit_vector_bounds(
+        center, radius
+    )
+
+    return {
+        "cx": center[0],
+        "cy": center[1],
+        "cz": center[2],
+        "cx_min": cx_min,
+        "cx_max": cx_max,
+        "cy_min": cy_min,
+        "cy_max": cy_max,
+        "cz_min": cz_min,
+        "cz_max": cz_max,
+        "cos_radius": math.cos(math.radians(radius)),
+    }
+
 
 class PostgresSourceStorage(ProvidesSourceStorage, PostgresPoolUser):
     """
@@ -65,37 +127,43 @@ class PostgresSourceStorage(ProvidesSourceStorage, PostgresPoolUser):
         Bulk insert sources, returns created source IDs.
         """
         query = """
-            INSERT INTO sources (source_id, name, ra, dec, variable, extra)
+            INSERT INTO sources (source_id, socat_id, name, ra, dec, variable, extra)
             SELECT *
             FROM UNNEST(
                 %(source_id)s::uuid[],
+                %(socat_id)s::integer[],
                 %(name)s::text[],
                 %(ra)s::double precision[],
                 %(dec)s::double precision[],
                 %(variable)s::boolean[],
                 %(extra)s::jsonb[]
             )
-            RETURNING source_id
         """
 
         with self.tracer.start_as_current_span("create_batch_sources") as span:
-            span.set_attribute("source.num_sources", sources)
-
-            data = defaultdict(list)
-
-            for source in sources:
-                source_dict = source.model_dump()
-                if source_dict["extra"] is not None:
-                    source_dict["extra"] = json.dumps(source_dict["extra"])
-                for key, value in source_dict.items():
-                    data[key].append(value)
+            span.set_attribute("source.num_sources", len(sources))
+
+            # Build the UNNEST columns straight from the model attributes
+            # rather than dumping every source to a dict first.
+            data = {
+                "source_id": [source.source_id for source in sources],
+                "socat_id": [source.socat_id for source in sources],
+                "name": [source.name for source in sources],
+                "ra": [source.ra for source in sources],
+                "dec": [source.dec for source in sources],
+                "variable": [source.variable for source in sources],
+                "extra": [
+                    None if source.extra is None else source.extra.model_dump_json()
+                    for source in sources
+                ],
+            }
 
             async with self.cursor() as cur:
                 await cur.execute(query, data)
-                response = await cur.fetchall()
-                source_ids = [row[0] for row in response]
 
-            return source_ids
+            # IDs are generated client-side, so there is nothing to read
+            # back from the server.
+            return data["source_id"]
 
     async def get(self, source_id: UUID) -> Source:
         """
@@ -168,18 +236,22 @@ class PostgresSourceStorage(ProvidesSourceStorage, PostgresPoolUser):
         with self.tracer.start_as_current_span("delete_source") as span:
             span.set_attribute("source.source_id", source_id)
 
-            # Check if source exists first
-            try:
-                await self.get(source_id)
-            except Exception:
-                from lightcurvedb.models.exceptions import SourceNotFoundException
-
-                raise SourceNotFoundException(f"Source {source_id} not found")
-
-            query = "DELETE FROM sources WHERE source_id = %(source_id)s"
+            # RETURNING reports whether the source existed in the same round
+            # trip, rather than checking with a separate SELECT first.
+            query = """
+                DELETE FROM sources
+                WHERE source_id = %(source_id)s
+                RETURNING source_id
+            """
 
             async with self.cursor() as cur:
                 await cur.execute(query, {"source_id": source_id})
+                row = await cur.fetchone()
+
+            if row is None:
+                from lightcurvedb.models.exceptions import SourceNotFoundException
+
+                raise SourceNotFoundException(f"Source {source_id} not found")
 
     async def get_in_bounds(
         self, ra_min: float, ra_max: float, dec_min: float, dec_max: float
@@ -214,3 +286,31 @@ class PostgresSourceStorage(ProvidesSourceStorage, PostgresPoolUser):
                 rows = await cur.fetchall()
 
                 return rows
+
+    async def get_in_radius(self, ra: float, dec: float, radius: float) -> list[Source]:
+        """
+        Get all sources within `radius` degrees of (ra, dec). The INT2 unit
+        vector index provides a bounding-cube prefilter, which is then refined
+        with the exact angular separation.
+        """
+        query = """
+            SELECT source_id, socat_id, name, ra, dec, variable, extra
+            FROM sources
+            WHERE cxi BETWEEN %(cx_min)s AND %(cx_max)s
+              AND cyi BETWEEN %(cy_min)s AND %(cy_max)s
+              AND czi BETWEEN %(cz_min)s AND %(cz_max)s
+              AND cos(radians(dec)) * cos(radians(ra)) * %(cx)s
+                + cos(radians(dec)) * sin(radians(ra)) * %(cy)s
+                + sin(radians(dec)) * %(cz)s >= %(cos_radius)s
+        """
+
+        with self.tracer.start_as_current_span("get_sources_in_radius") as span:
+            span.set_attribute("source.ra", ra)
+            span.set_attribute("source.dec", dec)
+            span.set_attribute("source.radius", radius)
+
+            async with self.cursor(row_factory=class_row(Source)) as cur:
+                await cur.execute(query, cone_search_parameters(ra, dec, radius))
+                rows = await cur.fetchall()
+
+                return rows
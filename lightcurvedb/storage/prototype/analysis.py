@@ -52,5 +52,7 @@ class ProvidesAnalysis(Protocol):
     ) -> dict[str, SourceStatistics]:
         """
         Get source statistics across all frequencies and modules.
+        Combinations with no measurements inside the time window are
+        omitted.
         """
         ...
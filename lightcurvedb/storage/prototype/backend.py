@@ -1,3 +1,5 @@
+import asyncio
+
 from lightcurvedb.storage.prototype.analysis import ProvidesAnalysis
 from lightcurvedb.storage.prototype.cutout import ProvidesCutoutStorage
 from lightcurvedb.storage.prototype.flux import ProvidesFluxMeasurementStorage
@@ -31,8 +33,9 @@ class Backend:
         self.lightcurves = lightcurves
 
     async def setup(self) -> None:
-        await self.instruments.setup()
-        await self.sources.setup()
+        # Instruments and sources have no dependencies on each other, so
+        # they can be created concurrently; everything after references them.
+        await asyncio.gather(self.instruments.setup(), self.sources.setup())
         await self.fluxes.setup()
         await self.cutouts.setup()
         await self.lightcurves.setup()
@@ -11,6 +11,7 @@ from psycopg_pool import AsyncConnectionPool
 from lightcurvedb.config import Settings
 from lightcurvedb.storage.postgres.analysis import PostgresAnalysisProvider
 from lightcurvedb.storage.postgres.instrument import PostgresInstrumentStorage
+from lightcurvedb.storage.postgres.pooler import connection_configurator
 from lightcurvedb.storage.postgres.source import PostgresSourceStorage
 from lightcurvedb.storage.prototype.backend import Backend
 from lightcurvedb.storage.timescale.cutout import TimescaleCutoutStorage
@@ -59,7 +60,13 @@ async def timescale_backend(settings: Settings) -> AsyncIterator[Backend]:
     except ImportError:
         pass
 
-    async with AsyncConnectionPool(conninfo=settings.database_url) as pool:
+    async with AsyncConnectionPool(
+        conninfo=settings.database_url,
+        min_size=settings.postgres_pool_min_size,
+        max_size=settings.postgres_pool_max_size,
+        configure=connection_configurator(settings),
+        open=False,
+    ) as pool:
         backend = await generate_timescale_backend(pool)
 
         yield backend
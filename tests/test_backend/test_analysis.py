@@ -5,12 +5,14 @@ Tests for database-side statistical analysis functions.
 import datetime
 from datetime import timezone
 
+import numpy as np
 import pytest
 from uuid_extensions import uuid7
 
 from lightcurvedb.models.flux import FluxMeasurement
 from lightcurvedb.models.instrument import Instrument
 from lightcurvedb.models.source import Source
+from lightcurvedb.storage.parquet.analysis import flux_statistics
 
 
 @pytest.mark.asyncio(loop_scope="session")
@@ -69,3 +71,95 @@ async def test_weighted_statistics(backend):
         await backend.fluxes.delete(measurement_id=measurement.measurement_id)
 
     await backend.sources.delete(source_id=source)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_source_statistics_window(backend):
+    """
+    Combinations with no measurements inside the window are omitted.
+    """
+    source = await backend.sources.create(
+        Source(name="WINDOW-TEST-001", ra=150.0, dec=30.0, variable=True)
+    )
+
+    january = datetime.datetime(2024, 1, 1, tzinfo=timezone.utc)
+    june = datetime.datetime(2024, 6, 1, tzinfo=timezone.utc)
+    measurements = [
+        FluxMeasurement(
+            measurement_id=uuid7(),
+            module="i1",
+            frequency=frequency,
+            source_id=source,
+            time=base_time + datetime.timedelta(days=i),
+            ra=150.0,
+            dec=30.0,
+            ra_uncertainty=0.1,
+            dec_uncertainty=0.1,
+            flux=10.0 + i,
+            flux_err=2.0,
+        )
+        for frequency, base_time in [(27, january), (39, june)]
+        for i in range(3)
+    ]
+    await backend.fluxes.create_batch(measurements)
+
+    stats = await backend.analysis.get_source_statistics(source_id=source)
+    assert set(stats) == {"i1_27", "i1_39"}
+
+    window = {
+        "start_time": january,
+        "end_time": january + datetime.timedelta(days=10),
+    }
+
+    stats = await backend.analysis.get_source_statistics(source_id=source, **window)
+    assert set(stats) == {"i1_27"}
+    assert stats["i1_27"].measurement_count == 3
+    assert stats["i1_27"].max_flux == 12.0
+
+    stats = await backend.analysis.get_source_statistics(
+        source_id=source, collate_modules=True, **window
+    )
+    assert set(stats) == {"27"}
+
+    # Either bound may be given alone.
+    stats = await backend.analysis.get_source_statistics(
+        source_id=source, start_time=june
+    )
+    assert set(stats) == {"i1_39"}
+
+    stats = await backend.analysis.get_source_statistics(
+        source_id=source, end_time=june - datetime.timedelta(days=1)
+    )
+    assert set(stats) == {"i1_27"}
+
+    for measurement in measurements:
+        await backend.fluxes.delete(measurement_id=measurement.measurement_id)
+
+    await backend.sources.delete(source_id=source)
+
+
+def test_flux_statistics():
+    """
+    The parquet reductions, compiled when numba is installed, match NumPy.
+    """
+    rng = np.random.default_rng(42)
+    flux = rng.normal(10.0, 2.0, size=101)
+    flux_err = rng.uniform(0.5, 2.0, size=101)
+    flux_err[::7] = np.nan
+    flux_err[::11] = 0.0
+
+    valid = ~np.isnan(flux_err) & (flux_err != 0)
+    weights = 1.0 / flux_err[valid] ** 2
+
+    assert flux_statistics(flux, flux_err) == pytest.approx(
+        {
+            "measurement_count": 101,
+            "min_flux": flux.min(),
+            "max_flux": flux.max(),
+            "mean_flux": flux.mean(),
+            "stddev_flux": flux.std(ddof=1),
+            "median_flux": np.median(flux),
+            "weighted_mean_flux": np.average(flux[valid], weights=weights),
+            "weighted_error_on_mean_flux": 1.0 / np.sqrt(weights.sum()),
+        }
+    )
@@ -2,9 +2,18 @@
 Test for grabbing cutouts.
 """
 
+import datetime
+import uuid
+
+import pandas as pd
 import pytest
+from uuid_extensions import uuid7
 
 from lightcurvedb.models.cutout import Cutout
+from lightcurvedb.models.flux import FluxMeasurement
+from lightcurvedb.models.source import Source
+from lightcurvedb.storage.parquet.cutout import PandasCutoutStorage
+from lightcurvedb.storage.postgres.cutout import PostgresCutoutStorage
 from lightcurvedb.storage.prototype.backend import Backend
 
 
@@ -63,3 +72,154 @@ async def test_cutout_write_and_delete(backend: Backend, setup_test_data):
         cutout.measurement_id != measurement_id
         for cutout in retrieved_cutouts_after_deletion
     )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cutout_read_in_cone(backend: Backend):
+    if not isinstance(backend.cutouts, PostgresCutoutStorage):
+        pytest.skip("Cone search is only provided by the PostgreSQL backends")
+
+    positions = [(-60.0, -45.0), (-60.0, -46.5)]
+    source_ids = await backend.sources.create_batch(
+        [Source(name="CONE-CUTOUT", ra=ra, dec=dec) for ra, dec in positions]
+    )
+
+    time = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    measurements = [
+        FluxMeasurement(
+            measurement_id=uuid7(),
+            source_id=source_id,
+            module="i1",
+            frequency=27,
+            time=time,
+            ra=ra,
+            dec=dec,
+            ra_uncertainty=0.1,
+            dec_uncertainty=0.1,
+            flux=1.0,
+            flux_err=0.1,
+        )
+        for source_id, (ra, dec) in zip(source_ids, positions)
+    ]
+    await backend.fluxes.create_batch(measurements)
+
+    await backend.cutouts.create_batch(
+        [
+            Cutout(
+                source_id=m.source_id,
+                measurement_id=m.measurement_id,
+                time=m.time,
+                frequency=m.frequency,
+                module=m.module,
+                data=[[0.1, 0.2], [0.3, 0.4]],
+                units="mJy",
+            )
+            for m in measurements
+        ]
+    )
+
+    inside, outside = measurements
+
+    cutouts = await backend.cutouts.retrieve_cutouts_in_cone(
+        ra=-60.0, dec=-45.0, radius=1.0
+    )
+    found = {cutout.measurement_id for cutout in cutouts}
+
+    assert inside.measurement_id in found
+    assert outside.measurement_id not in found
+
+    for measurement in measurements:
+        await backend.cutouts.delete(measurement.measurement_id)
+        await backend.fluxes.delete(measurement_id=measurement.measurement_id)
+
+    for source_id in source_ids:
+        await backend.sources.delete(source_id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cutout_read_batch(backend: Backend, setup_test_data):
+    if not isinstance(backend.cutouts, PostgresCutoutStorage):
+        pytest.skip("Batch retrieval is only provided by the PostgreSQL backends")
+
+    source_id = setup_test_data[0]
+
+    cutouts = await backend.cutouts.retrieve_cutouts_for_source(source_id)
+    assert len(cutouts) >= 2
+
+    first, second = cutouts[0], cutouts[1]
+    keys = [
+        (second.source_id, second.measurement_id),
+        (source_id, uuid.uuid4()),
+        (first.source_id, first.measurement_id),
+    ]
+
+    retrieved = await backend.cutouts.retrieve_cutouts_batch(keys)
+
+    # Rows come back in key order, and the missing pair is skipped.
+    assert [cutout.measurement_id for cutout in retrieved] == [
+        second.measurement_id,
+        first.measurement_id,
+    ]
+    assert retrieved[0].data == second.data
+
+    assert await backend.cutouts.retrieve_cutouts_batch([]) == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cutout_indexed_delete(backend: Backend, setup_test_data):
+    if not isinstance(backend.cutouts, PandasCutoutStorage):
+        pytest.skip("The cutout index is specific to the parquet backend")
+
+    source_id = setup_test_data[0]
+    cutout = (await backend.cutouts.retrieve_cutouts_for_source(source_id))[0]
+    key = str(cutout.measurement_id)
+
+    assert backend.cutouts._index.source(key) == str(source_id)
+
+    await backend.cutouts.delete(cutout.measurement_id)
+
+    assert backend.cutouts._index.source(key) is None
+    assert all(
+        other.measurement_id != cutout.measurement_id
+        for other in await backend.cutouts.retrieve_cutouts_for_source(source_id)
+    )
+
+    # Put the cutout back for the tests that read this source.
+    await backend.cutouts.create(cutout)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_parquet_legacy_cutouts_migrated(tmp_path):
+    storage = PandasCutoutStorage(tmp_path / "cutouts")
+    source_id = uuid.uuid4()
+    cutout = Cutout(
+        measurement_id=uuid7(),
+        data=[[1.0, 2.0], [3.0, 4.0]],
+        time=datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc),
+        units="mJy",
+        frequency=90,
+        module="i1",
+        source_id=source_id,
+    )
+
+    # The single file per source written by earlier versions.
+    legacy = pd.DataFrame(
+        [
+            {
+                **cutout.model_dump(),
+                "measurement_id": str(cutout.measurement_id),
+                "source_id": str(source_id),
+            }
+        ]
+    ).set_index("measurement_id")
+    storage.base_path.mkdir(parents=True)
+    legacy.to_parquet(storage.base_path / f"{source_id}.parquet")
+
+    await storage.setup()
+
+    assert not (storage.base_path / f"{source_id}.parquet").exists()
+    assert await storage.retrieve_cutouts_for_source(source_id) == [cutout]
+    assert storage._index.source(str(cutout.measurement_id)) == str(source_id)
+
+    await storage.delete(cutout.measurement_id)
+    assert await storage.retrieve_cutouts_for_source(source_id) == []
@@ -95,3 +95,31 @@ async def test_ingest_dataframe(
 
     for measurement in inserted:
         await backend.fluxes.delete(measurement_id=measurement.measurement_id)
+
+
+@pytest.mark.parametrize("parquet_ingest_mode", ["csv", "duckdb", None])
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ingest_dataframe_rejects_invalid_positions(
+    backend: Backend, sample_flux_dataframe, parquet_ingest_mode
+):
+    payload = sample_flux_dataframe
+
+    df = pd.DataFrame(payload["rows"])
+    df.loc[1, "ra"] = 200.0
+
+    file = BytesIO()
+    df.to_parquet(file, index=False)
+    file.seek(0)
+
+    with pytest.raises(ValueError):
+        await backend.fluxes.ingest_dataframe(
+            parquet_bytes=file, parquet_ingest_mode=parquet_ingest_mode
+        )
+
+    lightcurve = await backend.lightcurves.get_instrument_lightcurve(
+        source_id=payload["source_id"],
+        module=payload["module"],
+        frequency=payload["frequency"],
+    )
+
+    assert not any(measurement.time.year == 2035 for measurement in lightcurve)
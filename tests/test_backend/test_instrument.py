@@ -2,10 +2,13 @@
 Tests for instrument client interface.
 """
 
+from contextlib import asynccontextmanager
+
 import pytest
 
 from lightcurvedb.models.exceptions import InstrumentNotFoundException
 from lightcurvedb.models.instrument import Instrument
+from lightcurvedb.storage.postgres.instrument import PostgresInstrumentStorage
 from lightcurvedb.storage.prototype.backend import Backend
 
 
@@ -51,3 +54,90 @@ async def test_instrument_creation_deletion_flow(backend: Backend):
         await backend.instruments.get(
             frequency=instrument.frequency, module=instrument.module
         )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_instrument_reads_follow_writes(backend: Backend):
+    instrument = Instrument(
+        frequency=106,
+        module="uv1",
+        telescope="hubble",
+        instrument="wfc3",
+        details={},
+    )
+
+    await backend.instruments.create(instrument=instrument)
+
+    # Repeated reads may be served from a cache; writes must not leave it stale.
+    for _ in range(2):
+        read_instrument = await backend.instruments.get(
+            frequency=instrument.frequency, module=instrument.module
+        )
+        assert read_instrument.telescope == "hubble"
+
+    await backend.instruments.delete(
+        frequency=instrument.frequency, module=instrument.module
+    )
+
+    with pytest.raises(InstrumentNotFoundException):
+        await backend.instruments.get(
+            frequency=instrument.frequency, module=instrument.module
+        )
+
+    await backend.instruments.create(
+        instrument=instrument.model_copy(update={"telescope": "jwst"})
+    )
+
+    read_instrument = await backend.instruments.get(
+        frequency=instrument.frequency, module=instrument.module
+    )
+    assert read_instrument.telescope == "jwst"
+
+    await backend.instruments.delete(
+        frequency=instrument.frequency, module=instrument.module
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_instrument_cache_skips_overlapping_reads(backend: Backend, monkeypatch):
+    storage = backend.instruments
+    if not isinstance(storage, PostgresInstrumentStorage):
+        pytest.skip("The instrument cache is specific to the PostgreSQL backends")
+
+    instrument = Instrument(
+        frequency=107,
+        module="uv1",
+        telescope="hubble",
+        instrument="wfc3",
+        details={},
+    )
+    await storage.create(instrument=instrument)
+
+    original = storage.cursor
+
+    @asynccontextmanager
+    async def cursor_then_write(**kwargs):
+        monkeypatch.setattr(storage, "cursor", original)
+
+        async with original(**kwargs) as cur:
+            yield cur
+
+        # Another task's write commits after the read, before it is cached.
+        await storage.delete(frequency=instrument.frequency, module=instrument.module)
+        await storage.create(
+            instrument=instrument.model_copy(update={"telescope": "jwst"})
+        )
+
+    monkeypatch.setattr(storage, "cursor", cursor_then_write)
+
+    read_instrument = await storage.get(
+        frequency=instrument.frequency, module=instrument.module
+    )
+    assert read_instrument.telescope == "hubble"
+
+    read_instrument = await storage.get(
+        frequency=instrument.frequency, module=instrument.module
+    )
+    assert read_instrument.telescope == "jwst"
+
+    await storage.delete(frequency=instrument.frequency, module=instrument.module)
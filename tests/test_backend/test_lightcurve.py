@@ -6,8 +6,13 @@ import datetime
 import random
 from uuid import UUID
 
+import numpy as np
 import pytest
+from uuid_extensions import uuid7
 
+from lightcurvedb.models.flux import FluxMeasurement
+from lightcurvedb.models.source import Source
+from lightcurvedb.storage.parquet.lightcurves import _bin_sums_loop, bin_sums
 from lightcurvedb.storage.prototype.backend import Backend
 
 
@@ -67,3 +72,81 @@ async def test_lightcurve_read_array_binned(
             assert result.source_id == source_id
             assert len(result.lightcurves) > 0
             assert result.binning_strategy == binning_strategy
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_lightcurve_binned_values(backend: Backend):
+    source_id = await backend.sources.create(
+        Source(name="BINNED-TEST-001", ra=10.0, dec=-10.0)
+    )
+
+    start_time = datetime.datetime(2024, 3, 1, tzinfo=datetime.timezone.utc)
+    hour = datetime.timedelta(hours=1)
+
+    # Two measurements either side of the first day boundary; the second
+    # day has one measurement without an uncertainty.
+    rows = [
+        (2 * hour, 1.0, 3.0),
+        (20 * hour, 3.0, 4.0),
+        (25 * hour, 5.0, None),
+        (47 * hour, 7.0, 2.0),
+    ]
+    measurements = [
+        FluxMeasurement(
+            measurement_id=uuid7(),
+            source_id=source_id,
+            module="i1",
+            frequency=27,
+            time=start_time + offset,
+            ra=10.0,
+            dec=-10.0,
+            ra_uncertainty=0.1,
+            dec_uncertainty=0.1,
+            flux=flux,
+            flux_err=flux_err,
+            extra=None,
+        )
+        for offset, flux, flux_err in rows
+    ]
+    await backend.fluxes.create_batch(measurements)
+
+    result = await backend.lightcurves.get_binned_instrument_lightcurve(
+        source_id=source_id,
+        module="i1",
+        frequency=27,
+        binning_strategy="1 day",
+        start_time=start_time,
+        end_time=start_time + datetime.timedelta(days=3),
+    )
+
+    assert result.time == [start_time + 12 * hour, start_time + 36 * hour]
+    assert result.ra == pytest.approx([10.0, 10.0])
+    assert result.dec == pytest.approx([-10.0, -10.0])
+    assert result.flux == pytest.approx([2.0, 6.0])
+    # sqrt(sum(err^2)) / n over the non-null uncertainties only.
+    assert result.flux_err == pytest.approx([2.5, 2.0])
+
+    for measurement in measurements:
+        await backend.fluxes.delete(measurement_id=measurement.measurement_id)
+
+    await backend.sources.delete(source_id=source_id)
+
+
+def test_bin_sums_loop():
+    """
+    The per-row loop compiled when numba is installed matches the bincount
+    reduction, including skipping NaN entries.
+    """
+    rng = np.random.default_rng(7)
+    index = rng.integers(0, 5, size=64)
+    values = rng.normal(size=(4, 64))
+    values[3, ::3] = np.nan
+    values[:, index == 2] = np.nan
+
+    expected_sums, expected_counts = bin_sums(index, 6, values)
+    sums, counts = _bin_sums_loop(index, 6, values)
+
+    np.testing.assert_allclose(sums, expected_sums)
+    np.testing.assert_array_equal(counts, expected_counts)
+    assert counts[:, 2].sum() == 0
+    assert counts[:, 5].sum() == 0
@@ -2,14 +2,22 @@
 Tests adding and removing a measurement.
 """
 
+import asyncio
 import datetime
 import random
+import sqlite3
 import uuid
+from contextlib import closing
 
+import numpy as np
+import pandas as pd
 import pytest
 from uuid_extensions import uuid7
 
 from lightcurvedb.models.flux import FluxMeasurement
+from lightcurvedb.models.source import Source
+from lightcurvedb.storage.parquet.flux import PandasFluxMeasurementStorage
+from lightcurvedb.storage.parquet.lightcurves import PandasLightcurves
 from lightcurvedb.storage.prototype.backend import Backend
 
 
@@ -53,6 +61,9 @@ async def test_measurement_add_and_delete(backend: Backend, setup_test_data):
 
     assert len(measurements_read) > 5, "Expected at least one extra in the lightcurve"
 
+    # The lightcurve, including the extra metadata, must serialize.
+    measurements_read.model_dump_json()
+
     for x, y in zip(
         sorted(measurement.model_dump().items()),
         sorted(measurement_recovered.model_dump().items()),
@@ -156,3 +167,195 @@ async def test_recent_measurements_for_non_existent_source(backend):
         source_id=uuid.uuid4(), frequency=123415, limit=100
     )
     assert len(measurements.flux) == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_measurement_indexed_delete(backend: Backend, setup_test_data):
+    if not isinstance(backend.fluxes, PandasFluxMeasurementStorage):
+        pytest.skip("The measurement index is specific to the parquet backend")
+
+    source_id = setup_test_data[0]
+
+    module, frequency = (
+        await backend.lightcurves.get_module_frequency_pairs_for_source(
+            source_id=source_id
+        )
+    )[0]
+
+    measurements = [
+        FluxMeasurement(
+            measurement_id=uuid7(),
+            source_id=source_id,
+            module=module,
+            frequency=frequency,
+            time=datetime.datetime.now(tz=datetime.timezone.utc),
+            flux=0.0,
+            flux_err=0.0,
+            ra=0.0,
+            dec=0.0,
+            ra_uncertainty=0.0,
+            dec_uncertainty=0.0,
+        )
+        for _ in range(16)
+    ]
+
+    def indexed() -> dict[bytes, str]:
+        with closing(sqlite3.connect(backend.fluxes.index_path)) as connection:
+            return dict(
+                connection.execute(
+                    "SELECT measurement_id, source_id FROM measurement_index"
+                )
+            )
+
+    # Concurrent inserts all write to the sidecar from worker threads.
+    await asyncio.gather(*[backend.fluxes.create(measurement=m) for m in measurements])
+
+    index = indexed()
+    for measurement in measurements:
+        assert index[measurement.measurement_id.bytes] == str(source_id)
+
+    for measurement in measurements:
+        await backend.fluxes.delete(measurement_id=measurement.measurement_id)
+
+    index = indexed()
+    assert all(m.measurement_id.bytes not in index for m in measurements)
+
+    lightcurve = await backend.lightcurves.get_instrument_lightcurve(
+        source_id=source_id, module=module, frequency=frequency
+    )
+    assert not {m.measurement_id for m in measurements} & set(lightcurve.measurement_id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_measurement_compact(backend: Backend):
+    if not isinstance(backend.fluxes, PandasFluxMeasurementStorage):
+        pytest.skip("Compaction is specific to the parquet backend")
+
+    source_id = await backend.sources.create(
+        Source(name="COMPACT-TEST-001", ra=10.0, dec=-10.0)
+    )
+
+    base_time = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    measurements = [
+        FluxMeasurement(
+            measurement_id=uuid7(),
+            source_id=source_id,
+            module="i1",
+            frequency=frequency,
+            time=base_time + datetime.timedelta(days=day, hours=batch),
+            flux=float(day + batch),
+            flux_err=1.0,
+            ra=10.0,
+            dec=-10.0,
+            ra_uncertainty=0.1,
+            dec_uncertainty=0.1,
+        )
+        for batch in range(3)
+        for frequency in [27, 39]
+        for day in range(4)
+    ]
+
+    # One fragment per batch and partition.
+    for batch in range(3):
+        await backend.fluxes.create_batch(measurements[batch * 8 : (batch + 1) * 8])
+
+    before = await backend.lightcurves.get_source_lightcurve(
+        source_id=source_id, selection_strategy="instrument"
+    )
+
+    await backend.fluxes.compact(threshold=1)
+
+    partitions = list(
+        backend.fluxes.base_path.glob(f"source_id={source_id}/frequency=*/module=*")
+    )
+    assert len(partitions) == 2
+    for partition in partitions:
+        assert len(list(partition.glob("*.parquet"))) == 1
+
+    after = await backend.lightcurves.get_source_lightcurve(
+        source_id=source_id, selection_strategy="instrument"
+    )
+    assert after.model_dump() == before.model_dump()
+
+    deleted, *remaining = measurements
+    await backend.fluxes.delete(measurement_id=deleted.measurement_id)
+
+    lightcurve = await backend.lightcurves.get_instrument_lightcurve(
+        source_id=source_id, module=deleted.module, frequency=deleted.frequency
+    )
+    assert deleted.measurement_id not in lightcurve.measurement_id
+    assert len(lightcurve.measurement_id) == 11
+
+    for measurement in remaining:
+        await backend.fluxes.delete(measurement_id=measurement.measurement_id)
+
+    await backend.sources.delete(source_id=source_id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_parquet_legacy_fluxes_migrated(tmp_path):
+    source_id = uuid.uuid4()
+    measurements = [
+        FluxMeasurement(
+            measurement_id=uuid.uuid4(),
+            source_id=source_id,
+            module="i1",
+            frequency=frequency,
+            time=datetime.datetime(2024, 1, day, tzinfo=datetime.timezone.utc),
+            flux=float(day),
+            flux_err=0.1,
+            ra=10.0,
+            dec=20.0,
+            ra_uncertainty=None,
+            dec_uncertainty=None,
+        )
+        for frequency in [27, 39]
+        for day in range(1, 4)
+    ]
+
+    # Earlier versions kept one file per source, indexed by the string ID.
+    def write_legacy():
+        legacy = pd.DataFrame(
+            [
+                {
+                    **m.model_dump(),
+                    "measurement_id": str(m.measurement_id),
+                    "source_id": str(m.source_id),
+                }
+                for m in measurements
+            ]
+        ).set_index("measurement_id")
+        legacy.to_parquet(tmp_path / "fluxes" / f"{source_id}.parquet")
+
+    (tmp_path / "fluxes").mkdir()
+    write_legacy()
+
+    storage = PandasFluxMeasurementStorage(tmp_path / "fluxes.parquet")
+    lightcurves = PandasLightcurves(flux_storage=storage)
+    await storage.setup()
+
+    assert not (tmp_path / "fluxes" / f"{source_id}.parquet").exists()
+
+    lightcurve = await lightcurves.get_instrument_lightcurve(
+        source_id=source_id, module="i1", frequency=27
+    )
+    assert lightcurve.measurement_id == [m.measurement_id for m in measurements[:3]]
+    assert lightcurve.flux == [1.0, 2.0, 3.0]
+    # The legacy float64 values are rounded to the float32 schema.
+    assert lightcurve.flux_err == [float(np.float32(0.1))] * 3
+
+    # An interrupted migration leaves the legacy file behind; running it
+    # again must not duplicate the rows.
+    write_legacy()
+    await storage.setup()
+
+    lightcurve = await lightcurves.get_instrument_lightcurve(
+        source_id=source_id, module="i1", frequency=39
+    )
+    assert len(lightcurve.measurement_id) == 3
+
+    await storage.delete(measurements[0].measurement_id)
+    lightcurve = await lightcurves.get_instrument_lightcurve(
+        source_id=source_id, module="i1", frequency=27
+    )
+    assert lightcurve.measurement_id == [m.measurement_id for m in measurements[1:3]]
@@ -0,0 +1,158 @@
+"""
+Tests upgrading a PostgreSQL database created by an earlier version.
+"""
+
+import datetime
+import uuid
+
+import psycopg
+import pytest
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+
+from lightcurvedb.storage.postgres.backend import generate_postgres_backend
+from lightcurvedb.storage.postgres.flux import PostgresFluxMeasurementStorage
+from lightcurvedb.storage.prototype.backend import Backend
+
+LEGACY_DATABASE = "lightcurvedb_legacy"
+
+# The tables as they were before flux_measurements and cutouts were
+# partitioned.
+LEGACY_SCHEMA = """
+CREATE TABLE sources (
+    source_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    socat_id INTEGER UNIQUE,
+    name TEXT,
+    ra DOUBLE PRECISION CHECK (ra IS NULL OR (ra >= -180 AND ra <= 180)),
+    dec DOUBLE PRECISION CHECK (dec IS NULL OR (dec >= -90 AND dec <= 90)),
+    variable BOOLEAN NOT NULL DEFAULT FALSE,
+    extra JSONB
+);
+
+CREATE TABLE instruments (
+    frequency INTEGER NOT NULL,
+    module TEXT NOT NULL,
+    telescope TEXT NOT NULL,
+    instrument TEXT NOT NULL,
+    details JSONB,
+    PRIMARY KEY (frequency, module)
+);
+
+CREATE TABLE flux_measurements (
+    measurement_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    frequency INTEGER NOT NULL,
+    module TEXT NOT NULL,
+    source_id UUID REFERENCES sources(source_id),
+    time TIMESTAMPTZ NOT NULL,
+    ra REAL NOT NULL CHECK (ra >= -180 AND ra <= 180),
+    dec REAL NOT NULL CHECK (dec >= -90 AND dec <= 90),
+    ra_uncertainty REAL,
+    dec_uncertainty REAL,
+    flux REAL NOT NULL,
+    flux_err REAL,
+    extra JSONB,
+    FOREIGN KEY (frequency, module) REFERENCES instruments(frequency, module)
+);
+
+CREATE INDEX idx_flux_source_id ON flux_measurements (source_id);
+CREATE INDEX idx_flux_time ON flux_measurements (time DESC);
+
+CREATE TABLE cutouts (
+    measurement_id UUID PRIMARY KEY REFERENCES flux_measurements(measurement_id),
+    source_id UUID REFERENCES sources(source_id),
+    frequency INTEGER NOT NULL,
+    module TEXT NOT NULL,
+    data real[][] NOT NULL,
+    time TIMESTAMPTZ NOT NULL,
+    units TEXT NOT NULL,
+    FOREIGN KEY (frequency, module) REFERENCES instruments(frequency, module)
+);
+
+CREATE INDEX idx_cutouts_measurement_id ON cutouts (measurement_id);
+"""
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_postgres_legacy_schema_migrated(backend: Backend):
+    if type(backend.fluxes) is not PostgresFluxMeasurementStorage:
+        pytest.skip("Migrates the plain PostgreSQL schema only")
+
+    conninfo = backend.fluxes.pool.conninfo
+
+    async with await psycopg.AsyncConnection.connect(
+        conninfo, autocommit=True
+    ) as connection:
+        await connection.execute(f"DROP DATABASE IF EXISTS {LEGACY_DATABASE}")
+        await connection.execute(f"CREATE DATABASE {LEGACY_DATABASE}")
+
+    source_id = uuid.uuid4()
+    measurement_id = uuid.uuid4()
+    time = datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc)
+
+    async with AsyncConnectionPool(
+        make_conninfo(conninfo, dbname=LEGACY_DATABASE), open=False
+    ) as pool:
+        async with pool.connection() as connection:
+            await connection.execute(LEGACY_SCHEMA)
+            await connection.execute(
+                "INSERT INTO sources (source_id, ra, dec) VALUES (%s, 10.0, 20.0)",
+                (source_id,),
+            )
+            await connection.execute(
+                "INSERT INTO instruments VALUES (27, 'i1', 'lat', 'latr', NULL)"
+            )
+            await connection.execute(
+                """
+                INSERT INTO flux_measurements (
+                    measurement_id, frequency, module, source_id, time,
+                    ra, dec, flux, flux_err
+                ) VALUES (%s, 27, 'i1', %s, %s, 10.0, 20.0, 1.5, 0.5)
+                """,
+                (measurement_id, source_id, time),
+            )
+            await connection.execute(
+                """
+                INSERT INTO cutouts (
+                    measurement_id, source_id, frequency, module, data, time, units
+                ) VALUES (%s, %s, 27, 'i1', '{{1.0, 2.0}, {3.0, 4.0}}', %s, 'mJy')
+                """,
+                (measurement_id, source_id, time),
+            )
+
+        migrated = await generate_postgres_backend(pool)
+
+        async with pool.connection() as connection:
+            cursor = await connection.execute(
+                """
+                SELECT relname, relkind::text FROM pg_class
+                WHERE relname IN (
+                    'flux_measurements', 'flux_measurements_unpartitioned',
+                    'cutouts', 'cutouts_unpartitioned'
+                )
+                """
+            )
+            tables = dict(await cursor.fetchall())
+
+        assert tables["flux_measurements"] == "p"
+        assert "flux_measurements_unpartitioned" not in tables
+        assert tables["cutouts"] == "p"
+        assert "cutouts_unpartitioned" not in tables
+
+        lightcurve = await migrated.lightcurves.get_instrument_lightcurve(
+            source_id=source_id, module="i1", frequency=27
+        )
+        assert lightcurve.measurement_id == [measurement_id]
+        assert lightcurve.time == [time]
+        assert lightcurve.flux == [1.5]
+
+        cutout = await migrated.cutouts.retrieve_cutout(source_id, measurement_id)
+        assert cutout.time == time
+        assert cutout.data == [[1.0, 2.0], [3.0, 4.0]]
+
+        # Running setup again on the migrated database changes nothing.
+        await migrated.setup()
+
+    async with await psycopg.AsyncConnection.connect(
+        conninfo, autocommit=True
+    ) as connection:
+        await connection.execute(f"DROP DATABASE {LEGACY_DATABASE}")
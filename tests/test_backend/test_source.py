@@ -4,6 +4,7 @@ Tests the source reading.
 
 import uuid
 
+import pandas as pd
 import pytest
 
 from lightcurvedb.client.source import (
@@ -11,6 +12,8 @@ from lightcurvedb.client.source import (
 )
 from lightcurvedb.models.exceptions import SourceNotFoundException
 from lightcurvedb.models.source import Source
+from lightcurvedb.storage.parquet.source import PandasSourceStorage
+from lightcurvedb.storage.postgres.source import PostgresSourceStorage
 
 
 @pytest.mark.asyncio(loop_scope="session")
@@ -70,3 +73,81 @@ async def test_add_read_remove_source(backend):
 
     with pytest.raises(SourceNotFoundException):
         await backend.sources.delete(id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_source_get_in_radius(backend):
+    if not isinstance(backend.sources, PostgresSourceStorage):
+        pytest.skip("Cone search is only provided by the PostgreSQL backends")
+
+    # (center, radius, inside, outside) for a plain field, a cone straddling
+    # the RA +/-180 seam, and one around the north pole.
+    cases = [
+        ((30.0, -20.0), 1.0, (30.0, -19.01), (30.0, -21.01)),
+        ((179.8, 5.0), 0.5, (-179.9, 5.0), (-179.0, 5.0)),
+        ((0.0, 89.8), 0.5, (150.0, 89.9), (180.0, 89.0)),
+    ]
+
+    for (ra, dec), radius, inside, outside in cases:
+        inside_id, outside_id = await backend.sources.create_batch(
+            [
+                Source(name="RADIUS-INSIDE", ra=inside[0], dec=inside[1]),
+                Source(name="RADIUS-OUTSIDE", ra=outside[0], dec=outside[1]),
+            ]
+        )
+
+        found = {
+            source.source_id
+            for source in await backend.sources.get_in_radius(
+                ra=ra, dec=dec, radius=radius
+            )
+        }
+
+        assert inside_id in found
+        assert outside_id not in found
+
+        await backend.sources.delete(inside_id)
+        await backend.sources.delete(outside_id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_parquet_legacy_sources_migrated(tmp_path):
+    sources = [
+        Source(name="LEGACY-001", ra=1.0, dec=2.0, socat_id=5),
+        Source(ra=3.0, dec=4.0, variable=True),
+    ]
+
+    # Earlier versions kept every source in one file indexed by source ID.
+    legacy = pd.DataFrame([source.model_dump() for source in sources])
+    legacy["source_id"] = legacy["source_id"].astype(str)
+    legacy.set_index("source_id").to_parquet(tmp_path / "sources.parquet")
+
+    storage = PandasSourceStorage(tmp_path / "sources.parquet")
+    await storage.setup()
+
+    assert not (tmp_path / "sources.parquet").exists()
+    assert await storage.get_all() == sources
+    assert await storage.get_by_socat_id(5) == sources[0]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_source_setup_adds_unit_vector_columns(backend):
+    if not isinstance(backend.sources, PostgresSourceStorage):
+        pytest.skip("The unit vector columns are specific to the PostgreSQL backends")
+
+    # A sources table created before the cone search existed.
+    async with backend.sources.cursor() as cur:
+        await cur.execute(
+            "ALTER TABLE sources DROP COLUMN cxi, DROP COLUMN cyi, DROP COLUMN czi"
+        )
+
+    await backend.sources.setup()
+
+    source_id = await backend.sources.create(
+        Source(name="UPGRADE-TEST-001", ra=-120.0, dec=33.0)
+    )
+
+    found = await backend.sources.get_in_radius(ra=-120.0, dec=33.0, radius=0.1)
+    assert source_id in {source.source_id for source in found}
+
+    await backend.sources.delete(source_id)